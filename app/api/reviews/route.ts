@@ -2,65 +2,136 @@ import { NextResponse } from 'next/server';
 import fs from 'fs';
 import path from 'path';
 
-export async function GET() {
+const OUTPUT_DIR = path.join(process.cwd(), 'automation', 'output');
+
+// Written by automation/reviews_artifact.py after every scrape
+const ARTIFACT_META = path.join(OUTPUT_DIR, 'reviews.meta.json');
+
+type ReviewsArtifact = {
+  mtimeMs: number;
+  etag: string;
+  bodies: Record<string, Uint8Array>;
+};
+
+let artifact: ReviewsArtifact | null = null;
+
+// Loaded once per artifact version; re-checked with a single stat per request
+function loadArtifact(): ReviewsArtifact | null {
+  let mtimeMs: number;
   try {
-    // Read the latest scraped data
-    const filePath = path.join(process.cwd(), 'automation', 'output', 'scraped_data_latest.json');
-    
-    if (!fs.existsSync(filePath)) {
-      return NextResponse.json({ 
-        reviews: [],
-        message: 'No scraped data found. Run the scraper first.' 
-      });
-    }
+    mtimeMs = fs.statSync(ARTIFACT_META).mtimeMs;
+  } catch {
+    artifact = null;
+    return null;
+  }
+  if (artifact && artifact.mtimeMs === mtimeMs) {
+    return artifact;
+  }
+
+  const meta = JSON.parse(fs.readFileSync(ARTIFACT_META, 'utf-8'));
+  const bodies: Record<string, Uint8Array> = {};
+  for (const [encoding, fileName] of Object.entries(meta.encodings as Record<string, string>)) {
+    bodies[encoding] = new Uint8Array(fs.readFileSync(path.join(OUTPUT_DIR, fileName)));
+  }
+  artifact = { mtimeMs, etag: meta.etag, bodies };
+  return artifact;
+}
+
+function pickEncoding(acceptEncoding: string, bodies: Record<string, Uint8Array>): string {
+  const accepted = acceptEncoding.toLowerCase();
+  if (bodies.br && accepted.includes('br')) return 'br';
+  if (bodies.gzip && accepted.includes('gzip')) return 'gzip';
+  return 'identity';
+}
+
+function serveArtifact(request: Request, current: ReviewsArtifact): Response {
+  const headers: Record<string, string> = {
+    'Content-Type': 'application/json; charset=utf-8',
+    'Cache-Control': 'public, max-age=0, must-revalidate',
+    'ETag': current.etag,
+    'Vary': 'Accept-Encoding'
+  };
+
+  if (request.headers.get('if-none-match') === current.etag) {
+    return new Response(null, { status: 304, headers });
+  }
 
-    const fileContent = fs.readFileSync(filePath, 'utf-8');
-    const data = JSON.parse(fileContent);
-
-    // Extract and format reviews
-    const reviews = (data.reviews || [])
-      .filter((review: any) => {
-        // Only include reviews with actual text content
-        const text = review.text || review.full_text || '';
-        return text.length > 20; // Minimum length to be considered a valid review
-      })
-      .map((review: any, index: number) => {
-        const text = review.text || review.full_text || '';
-        // Clean up text - remove extra whitespace and newlines
-        const cleanText = text.replace(/\s+/g, ' ').trim();
-        
-        // Extract project type from review text if possible
-        let project = 'Painting Project';
-        const textLower = cleanText.toLowerCase();
-        if (textLower.includes('cabin') || textLower.includes('exterior')) {
-          project = 'Exterior Painting';
-        } else if (textLower.includes('fence')) {
-          project = 'Fence Staining';
-        } else if (textLower.includes('interior') || textLower.includes('walls')) {
-          project = 'Interior Painting';
-        } else if (textLower.includes('cabinet')) {
-          project = 'Cabinet Refinishing';
-        } else if (textLower.includes('house')) {
-          project = 'Exterior Painting';
-        }
-        
-        return {
-          id: index + 1,
-          text: cleanText,
-          author: review.author || review.name || 'Customer',
-          location: review.location || 'Northern Michigan',
-          project: review.project || project,
-          rating: typeof review.rating === 'number' ? review.rating : 5,
-          date: review.date || review.timestamp || review.extracted_at || ''
-        };
-      });
-
-    return NextResponse.json({ reviews });
+  const encoding = pickEncoding(request.headers.get('accept-encoding') || '', current.bodies);
+  if (encoding !== 'identity') {
+    headers['Content-Encoding'] = encoding;
+  }
+  return new Response(current.bodies[encoding] as BodyInit, { headers });
+}
+
+// Fallback for output written before the artifact existed - parses and
+// classifies the whole snapshot on every request
+function legacyReviews() {
+  // Read the latest scraped data
+  const filePath = path.join(OUTPUT_DIR, 'scraped_data_latest.json');
+
+  if (!fs.existsSync(filePath)) {
+    return NextResponse.json({
+      reviews: [],
+      message: 'No scraped data found. Run the scraper first.'
+    });
+  }
+
+  const fileContent = fs.readFileSync(filePath, 'utf-8');
+  const data = JSON.parse(fileContent);
+
+  // Extract and format reviews
+  const reviews = (data.reviews || [])
+    .filter((review: any) => {
+      // Only include reviews with actual text content
+      const text = review.text || review.full_text || '';
+      return text.length > 20; // Minimum length to be considered a valid review
+    })
+    .map((review: any, index: number) => {
+      const text = review.text || review.full_text || '';
+      // Clean up text - remove extra whitespace and newlines
+      const cleanText = text.replace(/\s+/g, ' ').trim();
+
+      // Extract project type from review text if possible
+      let project = 'Painting Project';
+      const textLower = cleanText.toLowerCase();
+      if (textLower.includes('cabin') || textLower.includes('exterior')) {
+        project = 'Exterior Painting';
+      } else if (textLower.includes('fence')) {
+        project = 'Fence Staining';
+      } else if (textLower.includes('interior') || textLower.includes('walls')) {
+        project = 'Interior Painting';
+      } else if (textLower.includes('cabinet')) {
+        project = 'Cabinet Refinishing';
+      } else if (textLower.includes('house')) {
+        project = 'Exterior Painting';
+      }
+
+      return {
+        id: index + 1,
+        text: cleanText,
+        author: review.author || review.name || 'Customer',
+        location: review.location || 'Northern Michigan',
+        project: review.project || project,
+        rating: typeof review.rating === 'number' ? review.rating : 5,
+        date: review.date || review.timestamp || review.extracted_at || ''
+      };
+    });
+
+  return NextResponse.json({ reviews });
+}
+
+export async function GET(request: Request) {
+  try {
+    const current = loadArtifact();
+    if (current) {
+      return serveArtifact(request, current);
+    }
+    return legacyReviews();
   } catch (error) {
     console.error('Error reading reviews:', error);
-    return NextResponse.json({ 
+    return NextResponse.json({
       reviews: [],
-      error: 'Failed to load reviews' 
+      error: 'Failed to load reviews'
     }, { status: 500 });
   }
 }
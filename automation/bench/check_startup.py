@@ -0,0 +1,89 @@
+"""
+CLI Startup Check
+Runs the non-browser CLI commands in fresh interpreters and fails if one
+is slower to start than the budget or pulls in a heavy dependency
+(Playwright, Pillow, requests, the Gemini SDK) it does not use
+
+Usage:
+  python bench/check_startup.py
+  python bench/check_startup.py --budget-ms 300 --repeats 10
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+AUTOMATION_DIR = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ('playwright', 'PIL', 'requests', 'google.generativeai', 'scraper')
+
+# Commands that need no browser; parse-from-fixture runs for real on the
+# bench corpus, the others only as far as their argument parsing
+COMMANDS = {
+    'help': ['--help'],
+    'parse-from-fixture': ['parse-from-fixture'],
+    'stats': ['stats', '--help'],
+    'export': ['export', '--help'],
+    'bench': ['bench', '--help'],
+}
+
+# Runs one command through cli.main() and reports which heavy modules got
+# loaded and how long it took - interpreter start-up is timed by the parent
+PROBE = """
+import sys, time
+started = time.perf_counter()
+import cli
+try:
+    cli.main({argv!r})
+except SystemExit:
+    pass
+elapsed = time.perf_counter() - started
+import json
+print(json.dumps({{'import_ms': elapsed * 1000, 'heavy': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+def probe(argv, repeats: int):
+    """Best-of-N wall time of a fresh interpreter running the probe"""
+    best = float('inf')
+    result = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, '-c', PROBE.format(argv=argv, heavy=HEAVY_MODULES)],
+            cwd=AUTOMATION_DIR, capture_output=True, text=True, check=True
+        )
+        best = min(best, time.perf_counter() - started)
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+    return best * 1000, result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check that non-browser CLI commands start fast')
+    parser.add_argument('--budget-ms', type=float, default=250,
+                        help='max wall time per command incl. interpreter start (default 250)')
+    parser.add_argument('--repeats', type=int, default=5, help='runs per command, best counts (default 5)')
+    args = parser.parse_args(argv)
+
+    failures = []
+    print("=" * 60)
+    print(f"CLI STARTUP (best of {args.repeats}, budget {args.budget_ms:.0f} ms)")
+    print("=" * 60)
+    for name, command_argv in COMMANDS.items():
+        wall_ms, result = probe(command_argv, args.repeats)
+        line = f"  {name:<20} {wall_ms:>7.1f} ms wall  {result['import_ms']:>6.1f} ms in cli"
+        if result['heavy']:
+            failures.append(name)
+            line += f"  [HEAVY IMPORT: {', '.join(result['heavy'])}]"
+        elif wall_ms > args.budget_ms:
+            failures.append(name)
+            line += "  [OVER BUDGET]"
+        print(line)
+
+    if failures:
+        print(f"[ERROR] Startup regressions: {', '.join(failures)}")
+        sys.exit(1)
+    print("[OK] All commands within budget")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Scraper CLI
+One entry point for the scraper and its tools. Every subcommand imports
+what it needs when it runs - Playwright, Pillow and friends only load for
+the commands that use them, so the others start in milliseconds
+(bench/check_startup.py keeps it that way).
+
+Usage:
+  python cli.py scrape [--url URL ...] [--parallel] [--store] ...
+  python cli.py daemon
+  python cli.py parse-from-fixture [cards.json]
+  python cli.py export [--page-url URL] [--name NAME] [--history]
+  python cli.py stats [--file scraped_data_latest.json] [--runs 5]
+  python cli.py bench [--cards 50000] [--update-baseline] ...
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+AUTOMATION_DIR = Path(__file__).resolve().parent
+OUTPUT_DIR = AUTOMATION_DIR / "output"
+CORPUS_FILE = AUTOMATION_DIR / "bench" / "corpus" / "cards.json"
+
+def _load_env():
+    from dotenv import load_dotenv
+    load_dotenv()
+
+def _snapshot_file(name: str = None) -> Path:
+    return OUTPUT_DIR / (f'scraped_data_{name}_latest.json' if name else 'scraped_data_latest.json')
+
+def cmd_scrape(args):
+    import asyncio
+
+    import scraper
+
+    _load_env()
+    # No URLs on the command line - the pages configured in .env, batch or single
+    batch_urls = [] if args.url else scraper.read_page_urls()
+    page_urls = args.url or batch_urls or [url for url in [os.getenv('FB_PAGE_URL', '').strip()] if url]
+    if not page_urls:
+        print("[ERROR] Pass --url or set FB_PAGE_URL / FB_PAGE_URLS in .env")
+        sys.exit(1)
+    if page_urls == ['https://www.facebook.com/your-business-page']:
+        print("[ERROR] Please update .env with your actual Facebook page URL")
+        sys.exit(1)
+
+    options = scraper.read_scraper_options()
+    for flag in ('parallel', 'incremental', 'store', 'stream', 'download_images',
+                 'capture_images', 'perceptual_dedupe', 'prune_dom'):
+        if getattr(args, flag):
+            options[flag] = True
+    if args.no_resource_filter:
+        options['resource_policy'] = False
+    if args.no_near_dedupe:
+        options['near_dedupe'] = False
+    if args.har_mode:
+        options['har_mode'] = args.har_mode
+    if args.parse_workers is not None:
+        options['parse_workers'] = args.parse_workers
+
+    if len(page_urls) > 1 or batch_urls:
+        pool_size = args.pool_size or int(os.getenv('SCRAPER_POOL_SIZE', '3'))
+        asyncio.run(scraper.scrape_many(page_urls, pool_size, **options))
+    else:
+        if os.getenv('SCRAPER_HAR_PATH'):
+            options['har_path'] = os.getenv('SCRAPER_HAR_PATH')
+        asyncio.run(scraper.UdebrockScraper(page_urls[0], **options).scrape())
+
+def cmd_daemon(args):
+    import asyncio
+
+    import daemon
+
+    try:
+        asyncio.run(daemon.main())
+    except KeyboardInterrupt:
+        print("[INFO] Daemon stopped")
+
+def cmd_parse_from_fixture(args):
+    from review_parser import main as parse_fixture
+    parse_fixture(args.path)
+
+def cmd_export(args):
+    from reviews_artifact import write_artifact
+
+    snapshot_file = _snapshot_file(args.name)
+    db_file = OUTPUT_DIR / "scraper.db"
+    if db_file.exists():
+        from store import ScrapeStore
+
+        _load_env()
+        page_url = args.page_url or os.getenv('FB_PAGE_URL')
+        if not page_url:
+            print("[ERROR] Pass --page-url or set FB_PAGE_URL")
+            sys.exit(1)
+        with ScrapeStore(db_file) as store:
+            try:
+                written = store.export_latest(page_url, snapshot_file, history=args.history)
+            except KeyError as e:
+                print(f"[ERROR] {e.args[0]}")
+                sys.exit(1)
+        print(f"[OK] Snapshot: {snapshot_file} ({written / 1024:.1f} KiB, from {db_file.name})")
+    elif not snapshot_file.exists():
+        print(f"[ERROR] Nothing to export - no {db_file.name} and no {snapshot_file.name}")
+        sys.exit(1)
+
+    meta = write_artifact(snapshot_file, OUTPUT_DIR, f'reviews_{args.name}' if args.name else 'reviews')
+    print(f"[OK] Reviews artifact: {meta['count']} reviews, ETag {meta['etag']}")
+
+def cmd_stats(args):
+    snapshot_file = Path(args.file) if args.file else _snapshot_file(args.name)
+    if not snapshot_file.exists():
+        print(f"[ERROR] No snapshot at {snapshot_file}")
+        sys.exit(1)
+    with open(snapshot_file, encoding='utf-8') as f:
+        data = json.load(f)
+
+    print(f"[SNAPSHOT] {snapshot_file}")
+    print(f"  - Business: {data.get('business_name')} ({data.get('page_url')})")
+    print(f"  - Scraped at: {data.get('scraped_at')}")
+    for kind in ('reviews', 'posts', 'images'):
+        print(f"  - {kind.capitalize()}: {len(data.get(kind) or [])}")
+    print(f"  - Metadata: {len(data.get('metadata') or {})} fields")
+
+    metrics_files = sorted(OUTPUT_DIR.glob(f'metrics_{args.name}_*.json' if args.name else 'metrics_[0-9]*.json'))
+    if metrics_files:
+        with open(metrics_files[-1], encoding='utf-8') as f:
+            metrics = json.load(f)
+        print(f"[METRICS] {metrics_files[-1].name}: {metrics['total_wall_s']}s total")
+        for phase, stats in metrics['phases'].items():
+            print(f"  - {phase}: {stats['wall_s']}s / {stats.get('ipc_calls', 0)} round-trips")
+
+    db_file = OUTPUT_DIR / "scraper.db"
+    if args.runs and db_file.exists():
+        from store import ScrapeStore
+
+        with ScrapeStore(db_file) as store:
+            runs = store.runs(data.get('page_url'), args.runs)
+        print(f"[RUNS] Last {len(runs)} in {db_file.name}:")
+        for run in runs:
+            print(f"  - #{run['id']} {run['scraped_at']}: {run['reviews']} reviews, {run['posts']} posts, "
+                  f"{run['images']} images{'' if run['finished_at'] else ' (unfinished)'}")
+
+def cmd_bench(args):
+    sys.path.insert(0, str(AUTOMATION_DIR / "bench"))
+    from bench_parser import main as bench_main
+    bench_main(args.bench_args)
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='cli.py', description='Facebook business page scraper and tools')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    scrape = commands.add_parser('scrape', help='scrape one or more pages (default: as configured in .env)')
+    scrape.add_argument('--url', action='append', help='page URL; repeat for a batch (default: FB_PAGE_URL(S))')
+    scrape.add_argument('--pool-size', type=int, help='contexts at once in batch mode (default SCRAPER_POOL_SIZE or 3)')
+    scrape.add_argument('--parallel', action='store_true', help='main, reviews and photos views in concurrent tabs')
+    scrape.add_argument('--incremental', action='store_true', help='stop at known items and merge into the snapshot')
+    scrape.add_argument('--store', action='store_true', help='upsert into output/scraper.db')
+    scrape.add_argument('--stream', action='store_true', help='stream records to NDJSON as they are extracted')
+    scrape.add_argument('--download-images', action='store_true', help='run images through the WebP pipeline')
+    scrape.add_argument('--capture-images', action='store_true', help="store image bytes from the browser's responses")
+    scrape.add_argument('--perceptual-dedupe', action='store_true', help='collapse visually identical images')
+    scrape.add_argument('--no-near-dedupe', action='store_true', help='keep near-duplicate reviews and posts apart')
+    scrape.add_argument('--prune-dom', action='store_true', help='swap collected cards for placeholders while scrolling')
+    scrape.add_argument('--parse-workers', type=int, metavar='N', help='parse review cards on N worker processes')
+    scrape.add_argument('--no-resource-filter', action='store_true', help='load every resource type')
+    scrape.add_argument('--har-mode', choices=('record', 'replay'), help='record or replay the network traffic')
+    scrape.set_defaults(handler=cmd_scrape)
+
+    daemon = commands.add_parser('daemon', help='keep a browser warm and refresh pages on a schedule')
+    daemon.set_defaults(handler=cmd_daemon)
+
+    parse = commands.add_parser('parse-from-fixture', help='parse saved review cards, no browser')
+    parse.add_argument('path', nargs='?', default=str(CORPUS_FILE), help='JSON list of card texts (default: bench corpus)')
+    parse.set_defaults(handler=cmd_parse_from_fixture)
+
+    export = commands.add_parser('export', help='write the latest snapshot and reviews artifact')
+    export.add_argument('--page-url', help='page to export from the store (default: FB_PAGE_URL)')
+    export.add_argument('--name', help='batch output name, e.g. udebrockfinishes')
+    export.add_argument('--history', action='store_true', help='every item ever stored, not just the latest run')
+    export.set_defaults(handler=cmd_export)
+
+    stats = commands.add_parser('stats', help='summarise the latest snapshot, metrics and stored runs')
+    stats.add_argument('--file', help='snapshot to read (default: the latest)')
+    stats.add_argument('--name', help='batch output name, e.g. udebrockfinishes')
+    stats.add_argument('--runs', type=int, default=5, help='stored runs to list (default 5, 0 = none)')
+    stats.set_defaults(handler=cmd_stats)
+
+    # Any further options go to bench/bench_parser.py unchanged
+    bench = commands.add_parser('bench', help='parser micro-benchmarks (options as bench/bench_parser.py)')
+    bench.set_defaults(handler=cmd_bench)
+
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if args.command == 'bench':
+        args.bench_args = extra
+    elif extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    args.handler(args)
+
+if __name__ == "__main__":
+    main()
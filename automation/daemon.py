@@ -0,0 +1,222 @@
+"""
+Scraper Daemon
+Keeps one Chromium warm and refreshes the configured pages on a schedule,
+so a refresh costs only the scrape itself - no interpreter, Playwright
+driver or browser start-up per run
+
+- Every page is refreshed each SCRAPER_DAEMON_INTERVAL minutes, +/- jitter
+- A failed page is retried with exponential backoff, capped at the interval
+- Each scrape runs in a fresh context; the browser itself is relaunched
+  every SCRAPER_DAEMON_RECYCLE scrapes (or when it dies) to bound memory
+- A local HTTP trigger queues on-demand refreshes:
+    curl -X POST http://127.0.0.1:8765/refresh            # every page
+    curl -X POST "http://127.0.0.1:8765/refresh?url=..."  # one page
+    curl http://127.0.0.1:8765/status
+
+Pages come from FB_PAGE_URLS / FB_PAGE_URLS_FILE, else FB_PAGE_URL;
+scraper options from the same SCRAPER_* variables as scraper.py.
+
+Usage:
+  python daemon.py
+"""
+import asyncio
+import json
+import os
+import random
+import time
+from datetime import datetime
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlparse
+
+from dotenv import load_dotenv
+from playwright.async_api import async_playwright
+
+from parse_pool import ParsePool
+from scraper import UdebrockScraper, launch_browser, page_slug, read_page_urls, read_scraper_options
+
+DEFAULT_INTERVAL_MIN = 360
+DEFAULT_JITTER = 0.1  # fraction of the interval
+DEFAULT_RECYCLE_EVERY = 20
+DEFAULT_TRIGGER_PORT = 8765
+RETRY_BASE_S = 60
+
+class PageSchedule:
+    """When one page is next due, and how its recent runs went"""
+
+    def __init__(self, page_url: str):
+        self.page_url = page_url
+        self.due = time.monotonic()  # first refresh straight away
+        self.failures = 0
+        self.last_run = None
+        self.last_status = None
+        self.last_error = None
+
+    def to_dict(self) -> dict:
+        return {
+            'page_url': self.page_url,
+            'due_in_s': max(0, round(self.due - time.monotonic())),
+            'failures': self.failures,
+            'last_run': self.last_run,
+            'last_status': self.last_status,
+            'last_error': self.last_error
+        }
+
+class ScraperDaemon:
+    def __init__(self, page_urls, interval_s: float = DEFAULT_INTERVAL_MIN * 60,
+                 jitter: float = DEFAULT_JITTER, recycle_every: int = DEFAULT_RECYCLE_EVERY,
+                 trigger_port: int = DEFAULT_TRIGGER_PORT, **scraper_options):
+        self.pages = {url: PageSchedule(url) for url in page_urls}
+        self.interval_s = interval_s
+        self.jitter = jitter
+        self.recycle_every = max(1, recycle_every)
+        self.trigger_port = trigger_port
+        self.scraper_options = scraper_options
+        # Shared by every refresh instead of one pool per scrape
+        parse_workers = scraper_options.pop('parse_workers', 0)
+        if parse_workers:
+            scraper_options['parse_pool'] = ParsePool(parse_workers)
+        self.browser = None
+        self.scrapes_on_browser = 0
+        self.wake = asyncio.Event()
+
+    def _jittered(self, seconds: float) -> float:
+        return seconds * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _reschedule(self, schedule: PageSchedule, ok: bool):
+        if ok:
+            schedule.failures = 0
+            delay = self._jittered(self.interval_s)
+        else:
+            schedule.failures += 1
+            delay = self._jittered(min(self.interval_s, RETRY_BASE_S * 2 ** (schedule.failures - 1)))
+        schedule.due = time.monotonic() + delay
+        print(f"[INFO] Next refresh of {schedule.page_url} in {delay / 60:.1f} min")
+
+    async def _ensure_browser(self, playwright):
+        if self.browser and (not self.browser.is_connected() or self.scrapes_on_browser >= self.recycle_every):
+            print(f"[INFO] Recycling browser after {self.scrapes_on_browser} scrapes")
+            try:
+                await self.browser.close()
+            except Exception:
+                pass
+            self.browser = None
+        if self.browser is None:
+            try:
+                self.browser = await launch_browser(playwright)
+            except Exception:
+                # Launch again on the next refresh rather than reuse a half-started browser
+                self.browser = None
+                raise
+            self.scrapes_on_browser = 0
+
+    async def _refresh(self, playwright, schedule: PageSchedule):
+        # A single page keeps the default scraped_data_latest.json the site reads
+        output_name = page_slug(schedule.page_url) if len(self.pages) > 1 else None
+        scraper = UdebrockScraper(schedule.page_url, output_name=output_name, **self.scraper_options)
+        schedule.last_run = datetime.now().isoformat()
+        started = time.perf_counter()
+        try:
+            await self._ensure_browser(playwright)
+            await scraper.scrape(self.browser)
+        except Exception as e:
+            schedule.last_status, schedule.last_error = 'error', str(e)
+            print(f"[ERROR] Refresh of {schedule.page_url} failed: {e}")
+            self._reschedule(schedule, ok=False)
+        else:
+            schedule.last_status, schedule.last_error = 'ok', None
+            print(f"[OK] Refreshed {schedule.page_url} in {time.perf_counter() - started:.1f}s")
+            self._reschedule(schedule, ok=True)
+        finally:
+            self.scrapes_on_browser += 1
+
+    def trigger(self, page_url: str = None) -> list:
+        """Make one page (or all of them) due now"""
+        targets = [self.pages[page_url]] if page_url else list(self.pages.values())
+        for schedule in targets:
+            schedule.due = time.monotonic()
+        self.wake.set()
+        return [schedule.page_url for schedule in targets]
+
+    async def _handle_trigger(self, reader, writer):
+        """Minimal HTTP/1.0: POST /refresh[?url=...], GET /status"""
+        status, body = 404, {'error': 'not found'}
+        try:
+            request_line = (await asyncio.wait_for(reader.readline(), 5)).decode('latin-1').split()
+            while (await asyncio.wait_for(reader.readline(), 5)) not in (b'\r\n', b'\n', b''):
+                pass  # headers are not needed
+            method, target = request_line[0], urlparse(request_line[1])
+            if target.path == '/status' and method == 'GET':
+                status, body = 200, {
+                    'browser_scrapes': self.scrapes_on_browser,
+                    'pages': [schedule.to_dict() for schedule in self.pages.values()]
+                }
+            elif target.path == '/refresh' and method == 'POST':
+                page_url = parse_qs(target.query).get('url', [None])[0]
+                if page_url and page_url not in self.pages:
+                    status, body = 404, {'error': f'unknown page {page_url}'}
+                else:
+                    status, body = 202, {'queued': self.trigger(page_url)}
+        except (asyncio.TimeoutError, IndexError, UnicodeDecodeError):
+            status, body = 400, {'error': 'bad request'}
+
+        data = json.dumps(body).encode('utf-8')
+        writer.write(f"HTTP/1.0 {status} {HTTPStatus(status).phrase}\r\n"
+                     f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n".encode('latin-1') + data)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def run(self):
+        # Loopback only - the trigger has no authentication
+        server = await asyncio.start_server(self._handle_trigger, '127.0.0.1', self.trigger_port)
+        print(f"[INFO] Trigger listening on http://127.0.0.1:{self.trigger_port} (POST /refresh, GET /status)")
+        print(f"[INFO] Refreshing {len(self.pages)} page(s) every {self.interval_s / 60:.0f} min "
+              f"(+/-{self.jitter:.0%}), browser recycled every {self.recycle_every} scrapes")
+
+        async with async_playwright() as playwright:
+            try:
+                while True:
+                    schedule = min(self.pages.values(), key=lambda s: s.due)
+                    wait_s = schedule.due - time.monotonic()
+                    if wait_s > 0:
+                        self.wake.clear()
+                        try:
+                            await asyncio.wait_for(self.wake.wait(), wait_s)
+                        except asyncio.TimeoutError:
+                            pass
+                        continue
+                    await self._refresh(playwright, schedule)
+            finally:
+                server.close()
+                if self.browser:
+                    await self.browser.close()
+                if self.scraper_options.get('parse_pool'):
+                    self.scraper_options['parse_pool'].close()
+
+async def main():
+    load_dotenv()
+    page_urls = read_page_urls() or [url for url in [os.getenv('FB_PAGE_URL', '').strip()] if url]
+    if not page_urls:
+        print("[ERROR] Set FB_PAGE_URL or FB_PAGE_URLS in .env")
+        return
+
+    options = read_scraper_options()
+    if options.pop('har_mode', None):
+        print("[WARN] SCRAPER_HAR_MODE is ignored in daemon mode")
+
+    daemon = ScraperDaemon(
+        page_urls,
+        interval_s=float(os.getenv('SCRAPER_DAEMON_INTERVAL', DEFAULT_INTERVAL_MIN)) * 60,
+        jitter=float(os.getenv('SCRAPER_DAEMON_JITTER', DEFAULT_JITTER)),
+        recycle_every=int(os.getenv('SCRAPER_DAEMON_RECYCLE', DEFAULT_RECYCLE_EVERY)),
+        trigger_port=int(os.getenv('SCRAPER_DAEMON_PORT', DEFAULT_TRIGGER_PORT)),
+        **options
+    )
+    await daemon.run()
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("[INFO] Daemon stopped")
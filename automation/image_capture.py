@@ -0,0 +1,112 @@
+"""
+Image Capture
+Taps the browser's own image responses while the page scrolls and writes
+CDN image bodies into a content-addressed store, so images never have to
+be downloaded a second time (and expired signed URLs don't matter)
+"""
+import asyncio
+import hashlib
+import os
+import re
+from pathlib import Path
+
+from seen_index import image_key
+
+ORIGINALS_DIR = Path(__file__).parent / "output" / "images" / "originals"
+
+# Facebook CDN images, minus profile-picture/icon thumbnails
+CDN_IMAGE_PATTERN = r'^(?!.*(?:p50x50|p32x32|s50x50)).*(?:scontent|fbcdn)'
+_CDN_IMAGE = re.compile(CDN_IMAGE_PATTERN)
+
+MAX_IMAGE_BYTES = 10 * 1024 * 1024
+MAX_TOTAL_BYTES = 500 * 1024 * 1024
+
+EXTENSIONS = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/webp': '.webp',
+    'image/gif': '.gif',
+    'image/avif': '.avif',
+    'image/heic': '.heic'
+}
+
+def _write(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+class ImageCapture:
+    """Context response listener that stores CDN image bodies by content hash"""
+
+    def __init__(self, store_dir=ORIGINALS_DIR, max_bytes: int = MAX_IMAGE_BYTES,
+                 max_total_bytes: int = MAX_TOTAL_BYTES):
+        self.store_dir = Path(store_dir)
+        self.max_bytes = max_bytes
+        self.max_total_bytes = max_total_bytes
+        self.captured = {}  # image key -> stored file
+        self.stats = {'captured': 0, 'duplicates': 0, 'skipped_size': 0, 'failed': 0, 'bytes_stored': 0}
+        self._total_bytes = 0
+        self._pending = set()
+        self._tasks = set()
+
+    def attach(self, context):
+        context.on('response', self._on_response)
+
+    def _on_response(self, response):
+        if response.request.resource_type != 'image' or not _CDN_IMAGE.search(response.url):
+            return
+        # Bodies are fetched as separate tasks so the event dispatch never
+        # waits on them; drain() collects them before the context closes
+        task = asyncio.ensure_future(self._capture(response))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _capture(self, response):
+        key = image_key(response.url)
+        if key in self.captured or key in self._pending:
+            self.stats['duplicates'] += 1
+            return
+        self._pending.add(key)
+        try:
+            await self._store(key, response)
+        finally:
+            self._pending.discard(key)
+
+    async def _store(self, key, response):
+        try:
+            length = int(response.headers.get('content-length', 0))
+        except ValueError:
+            length = 0
+        if length > self.max_bytes or self._total_bytes + length > self.max_total_bytes:
+            self.stats['skipped_size'] += 1
+            return
+
+        try:
+            body = await response.body()
+        except Exception:
+            # Redirects, aborted loads and already-closed pages have no body
+            self.stats['failed'] += 1
+            return
+        if not body or len(body) > self.max_bytes or self._total_bytes + len(body) > self.max_total_bytes:
+            self.stats['skipped_size'] += 1
+            return
+
+        digest = hashlib.sha256(body).hexdigest()
+        content_type = response.headers.get('content-type', '').split(';')[0].strip()
+        path = self.store_dir / digest[:2] / f"{digest}{EXTENSIONS.get(content_type, '.img')}"
+        self._total_bytes += len(body)
+        if not path.exists():
+            await asyncio.to_thread(_write, path, body)
+            self.stats['bytes_stored'] += len(body)
+        self.captured[key] = path
+        self.stats['captured'] += 1
+
+    async def drain(self):
+        """Wait for in-flight captures - call before the context closes"""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def local_path(self, url: str):
+        return self.captured.get(image_key(url))
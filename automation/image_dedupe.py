@@ -0,0 +1,152 @@
+"""
+Perceptual Image Dedupe
+dHash fingerprints in a BK-tree, persisted across runs, so the same photo
+served under different signed URLs or sizes collapses to one entry
+"""
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from PIL import Image
+
+INDEX_FILE = Path(__file__).parent / "output" / "images" / "phash_index.json"
+
+# Max differing bits (of 64) for two images to count as the same photo -
+# absorbs re-encoding and resizing, not crops or edits
+MAX_DISTANCE = 6
+
+# Near-empty (or near-full) hashes come from flat or purely vertical
+# gradients and would match each other regardless of content
+MIN_SET_BITS = 4
+
+# Pages of a batch run collapse their images concurrently, each with its
+# own index over the shared file
+_SAVE_LOCK = threading.Lock()
+
+def dhash(path, size: int = 8) -> int:
+    """64-bit difference hash: brightness gradient of a (size+1) x size grayscale thumbnail"""
+    with Image.open(path) as image:
+        image.draft('L', (size * 4, size * 4))  # cheap JPEG downscale while decoding
+        pixels = list(image.convert('L').resize((size + 1, size), Image.LANCZOS).getdata())
+    bits = 0
+    for row in range(size):
+        offset = row * (size + 1)
+        for col in range(size):
+            bits = (bits << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return bits
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+class BKTree:
+    """Metric tree over Hamming distance - lookups visit only the branches
+    whose edge distance can still hold a match (triangle inequality)"""
+
+    def __init__(self):
+        self.root = None  # node: [hash, key, {distance: child}]
+        self.size = 0
+
+    def add(self, value: int, key: str) -> bool:
+        if self.root is None:
+            self.root = [value, key, {}]
+            self.size = 1
+            return True
+        node = self.root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                return False
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, key, {}]
+                self.size += 1
+                return True
+            node = child
+
+    def nearest(self, value: int, max_distance: int):
+        """(key, distance) of the closest stored hash within max_distance, or None"""
+        best = None
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            distance = hamming(value, node[0])
+            if distance <= max_distance and (best is None or distance < best[1]):
+                best = (node[1], distance)
+                if distance == 0:
+                    break
+            low, high = distance - max_distance, distance + max_distance
+            stack.extend(child for edge, child in node[2].items() if low <= edge <= high)
+        return best
+
+class PerceptualIndex:
+    """Persistent hash -> canonical image key index"""
+
+    def __init__(self, path=INDEX_FILE, max_distance: int = MAX_DISTANCE):
+        self.path = Path(path)
+        self.max_distance = max_distance
+        self.tree = BKTree()
+        self.entries = []  # [hex hash, key] in insertion order, rebuilt into the tree on load
+        if self.path.exists():
+            with open(self.path, encoding='utf-8') as f:
+                for value, key in json.load(f):
+                    self._insert(int(value, 16), key)
+
+    def _insert(self, value: int, key: str):
+        if self.tree.add(value, key):
+            self.entries.append([f'{value:016x}', key])
+
+    def canonical(self, value: int, key: str) -> str:
+        """Key of the stored near-duplicate, or `key` itself after indexing it"""
+        match = self.tree.nearest(value, self.max_distance)
+        if match:
+            return match[0]
+        self._insert(value, key)
+        return key
+
+    def save(self):
+        """Merge in hashes stored since this index loaded, then replace the file atomically"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with _SAVE_LOCK:
+            if self.path.exists():
+                with open(self.path, encoding='utf-8') as f:
+                    for value, key in json.load(f):
+                        self._insert(int(value, 16), key)
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self.path.parent,
+                                             suffix='.tmp', delete=False) as f:
+                json.dump(self.entries, f)
+            os.replace(f.name, self.path)
+
+def collapse_duplicates(images: list, output_dir: Path, index: PerceptualIndex = None) -> list:
+    """Collapse visually identical entries of results['images'] to one canonical entry
+
+    Uses whichever local bytes an entry has - the pipeline's thumb variant
+    or the captured original; entries without either pass through as-is.
+    Duplicates' URLs are kept on the canonical entry as 'alias_urls'.
+    """
+    index = index or PerceptualIndex()
+    kept = {}
+    collapsed = []
+    for image in images:
+        local = (image.get('variants') or {}).get('thumb') or image.get('local_path')
+        if local and (output_dir / local).exists():
+            try:
+                value = dhash(output_dir / local)
+            except OSError:
+                value = None  # format Pillow can't decode (e.g. HEIC)
+            if value is not None and MIN_SET_BITS <= value.bit_count() <= 64 - MIN_SET_BITS:
+                image['dhash'] = f'{value:016x}'
+                image['key'] = index.canonical(value, image['key'])
+
+        canonical = kept.get(image['key'])
+        if canonical is not None:
+            canonical.setdefault('alias_urls', []).append(image['url'])
+            continue
+        kept[image['key']] = image
+        collapsed.append(image)
+
+    for position, image in enumerate(collapsed, 1):
+        image['index'] = position
+    index.save()
+    return collapsed
@@ -0,0 +1,183 @@
+"""
+Image Pipeline
+Downloads scraped image URLs concurrently over one pooled HTTP session,
+decodes each image once and writes resized WebP variants (thumb, card,
+hero) into a content-addressed store under output/images/
+
+Images whose stable key is already in the manifest are never fetched
+again, and bytes whose hash is already stored are never re-encoded.
+"""
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from PIL import Image, ImageOps
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from seen_index import image_key
+
+STORE_DIR = Path(__file__).parent / "output" / "images"
+
+# Max width per variant; images are never upscaled. Ordered largest
+# first so each smaller variant is resized from the one before it.
+VARIANTS = (
+    ('hero', 1920),
+    ('card', 800),
+    ('thumb', 320),
+)
+VARIANT_FORMAT = 'WEBP'
+VARIANT_QUALITY = 80
+MAX_IMAGE_BYTES = 20 * 1024 * 1024
+
+# Pages of a batch run process their images concurrently, each pipeline
+# saving its own view of the shared manifest
+_MANIFEST_LOCK = threading.Lock()
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+def make_session(pool_size: int) -> requests.Session:
+    """One keep-alive session whose connection pool matches the worker count"""
+    session = requests.Session()
+    retries = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retries)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['User-Agent'] = USER_AGENT
+    return session
+
+def variant_paths(digest: str, store_dir: Path = STORE_DIR) -> dict:
+    """Store path of each variant - content-addressed by the source bytes"""
+    folder = store_dir / digest[:2]
+    return {name: folder / f"{digest}_{name}.webp" for name, _ in VARIANTS}
+
+def encode_variants(data: bytes, digest: str, store_dir: Path = STORE_DIR) -> dict:
+    """Decode once, then write every variant; returns the source's size
+    
+    Bytes already in the store (same digest) only have their header read.
+    """
+    paths = variant_paths(digest, store_dir)
+    with Image.open(io.BytesIO(data)) as source:
+        if all(path.exists() for path in paths.values()):
+            return {'width': source.width, 'height': source.height, 'encoded': False}
+
+        image = ImageOps.exif_transpose(source)
+        image = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+        width, height = image.size
+
+        paths[VARIANTS[0][0]].parent.mkdir(parents=True, exist_ok=True)
+        for name, max_width in VARIANTS:
+            if image.width > max_width:
+                image = image.resize((max_width, round(image.height * max_width / image.width)),
+                                     Image.LANCZOS)
+            tmp_path = paths[name].with_suffix('.tmp')
+            image.save(tmp_path, VARIANT_FORMAT, quality=VARIANT_QUALITY, method=4)
+            os.replace(tmp_path, paths[name])
+
+    return {'width': width, 'height': height, 'encoded': True}
+
+class ImagePipeline:
+    """Fetch, dedupe and re-encode scraped images into the variant store"""
+
+    def __init__(self, store_dir=STORE_DIR, workers: int = 8, timeout: float = 20):
+        self.store_dir = Path(store_dir)
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.manifest_path = self.store_dir / "manifest.json"
+        self.manifest = {}
+        if self.manifest_path.exists():
+            with open(self.manifest_path, encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        self.stats = {'fetched': 0, 'local': 0, 'cached': 0, 'encoded': 0, 'failed': 0, 'bytes_fetched': 0}
+
+    def _stored(self, entry) -> bool:
+        return bool(entry) and all(path.exists() for path in variant_paths(entry['sha256'], self.store_dir).values())
+
+    def _fetch(self, session, url: str) -> bytes:
+        with session.get(url, timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            chunks = []
+            size = 0
+            for chunk in response.iter_content(64 * 1024):
+                size += len(chunk)
+                if size > MAX_IMAGE_BYTES:
+                    raise ValueError(f"image larger than {MAX_IMAGE_BYTES} bytes")
+                chunks.append(chunk)
+        return b''.join(chunks)
+
+    def _process_one(self, session, key: str, url: str, local_path=None):
+        entry = self.manifest.get(key)
+        if self._stored(entry):
+            return key, entry, 'cached'
+
+        if local_path and local_path.exists():
+            # Captured from the browser's own response - no second fetch
+            data = local_path.read_bytes()
+            outcome = 'local'
+        else:
+            data = self._fetch(session, url)
+            outcome = 'fetched'
+        digest = hashlib.sha256(data).hexdigest()
+        info = encode_variants(data, digest, self.store_dir)
+        return key, dict(info, sha256=digest, bytes=len(data)), outcome
+
+    def process(self, images: list) -> list:
+        """Fill in 'sha256' and 'variants' on each results['images'] entry"""
+        jobs = {}
+        for image in images:
+            key = image.get('key') or image_key(image.get('url'))
+            if key and image.get('url'):
+                local_path = self.store_dir.parent / image['local_path'] if image.get('local_path') else None
+                jobs.setdefault(key, (image['url'], local_path))
+
+        print(f"[INFO] Processing {len(jobs)} images with {self.workers} workers...")
+        with make_session(self.workers) as session, ThreadPoolExecutor(self.workers) as pool:
+            futures = [pool.submit(self._process_one, session, key, url, local_path)
+                       for key, (url, local_path) in jobs.items()]
+            for future in futures:
+                try:
+                    key, entry, outcome = future.result()
+                except Exception as e:
+                    self.stats['failed'] += 1
+                    print(f"  [WARN] Image failed: {e}")
+                    continue
+                if entry.pop('encoded', False):
+                    self.stats['encoded'] += 1
+                self.manifest[key] = entry
+                self.stats[outcome] += 1
+                if outcome == 'fetched':
+                    self.stats['bytes_fetched'] += entry['bytes']
+
+        for image in images:
+            entry = self.manifest.get(image.get('key') or image_key(image.get('url')))
+            if entry:
+                image['sha256'] = entry['sha256']
+                image['variants'] = {
+                    name: path.relative_to(self.store_dir.parent).as_posix()
+                    for name, path in variant_paths(entry['sha256'], self.store_dir).items()
+                }
+
+        self._save_manifest()
+        print(f"[OK] Images: {self.stats['fetched']} fetched, {self.stats['local']} from capture "
+              f"({self.stats['encoded']} encoded), {self.stats['cached']} cached, {self.stats['failed']} failed "
+              f"({self.stats['bytes_fetched'] / 1e6:.1f} MB)")
+        return images
+
+    def _save_manifest(self):
+        """Merge into the stored manifest (this pipeline's entries win) and
+        replace it atomically"""
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        with _MANIFEST_LOCK:
+            if self.manifest_path.exists():
+                with open(self.manifest_path, encoding='utf-8') as f:
+                    self.manifest = {**json.load(f), **self.manifest}
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self.store_dir,
+                                             suffix='.tmp', delete=False) as f:
+                json.dump(self.manifest, f, indent=2)
+            os.replace(f.name, self.manifest_path)
@@ -0,0 +1,70 @@
+"""
+Run Metrics
+Per-phase wall time and counters for a scrape, written as a
+machine-readable metrics_*.json next to the scraped_data_*.json output
+"""
+import json
+import time
+from contextlib import contextmanager
+
+# Counter names used by the scraper - any other name is accepted too
+IPC_CALLS = 'ipc_calls'
+# Not measured: modelled from what the old element-by-element extraction
+# did for the same elements (see UdebrockScraper._count_legacy)
+IPC_CALLS_PER_ELEMENT = 'ipc_calls_per_element_estimate'
+ITEMS_FOUND = 'items_found'
+ITEMS_KEPT = 'items_kept'
+TIMEOUTS = 'timeouts'
+BYTES_WRITTEN = 'bytes_written'
+
+class RunMetrics:
+    """Wall time and counters per phase, plus free-form run info"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.info = {}
+
+    def _phase(self, name: str) -> dict:
+        return self.phases.setdefault(name, {'wall_s': 0.0, 'runs': 0})
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block; re-entering the same phase adds to its total"""
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.add_time(name, time.perf_counter() - started)
+
+    def add_time(self, name: str, seconds: float):
+        stats = self._phase(name)
+        stats['wall_s'] += seconds
+        stats['runs'] += 1
+
+    def count(self, phase: str, counter: str, n: int = 1):
+        stats = self._phase(phase)
+        stats[counter] = stats.get(counter, 0) + n
+
+    def total(self, counter: str) -> int:
+        return sum(stats.get(counter, 0) for stats in self.phases.values())
+
+    def to_dict(self) -> dict:
+        phases = {}
+        for name, stats in self.phases.items():
+            phases[name] = dict(stats, wall_s=round(stats['wall_s'], 3))
+        return {
+            'total_wall_s': round(time.perf_counter() - self.started, 3),
+            'totals': {
+                counter: self.total(counter)
+                for counter in (IPC_CALLS, IPC_CALLS_PER_ELEMENT, TIMEOUTS, BYTES_WRITTEN)
+            },
+            'phases': phases,
+            **self.info
+        }
+
+    def write(self, path) -> int:
+        data = json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        return len(data.encode('utf-8'))
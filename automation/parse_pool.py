@@ -0,0 +1,77 @@
+"""
+Review Parse Pool
+Runs the CPU-bound part of review extraction - card filtering, dedupe keys
+and parse_review's regex cleanup - in worker processes, in batches, so the
+event loop keeps driving the browser pages while cards are parsed on the
+other cores.
+
+One pool is shared by every page of a batch run (scrape_many, daemon);
+inputs too small to be worth the pickling round-trip are parsed inline.
+"""
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from review_parser import is_review_card, parse_review
+from seen_index import item_key, review_key
+
+BATCH_SIZE = 200
+# Below this many cards the pool round-trip costs more than it saves
+MIN_POOL_CARDS = 50
+
+def card_key(record, text: str):
+    """Key of a review card: the parsed review's (as record_key() re-keys
+    stored reviews), else the raw text's for cards that did not parse"""
+    return review_key(record.author, record.text) if record else item_key(text)
+
+def parse_cards(cards):
+    """Parse (text, stars) pairs into (key, ReviewRecord or None), or None
+    for a card that is not a review at all
+
+    Module-level so worker processes can import it.
+    """
+    parsed = []
+    for text, stars in cards:
+        if not is_review_card(text):
+            parsed.append(None)
+        else:
+            record = parse_review(text, stars)
+            parsed.append((card_key(record, text), record))
+    return parsed
+
+def _ready():
+    return os.getpid()
+
+class ParsePool:
+    """Batches of review cards parsed on a process pool"""
+
+    def __init__(self, workers: int = None, batch_size: int = BATCH_SIZE):
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.batch_size = batch_size
+        self.executor = None
+
+    async def start(self):
+        """Spawn the workers now (e.g. while the browser launches), not on first use"""
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*(loop.run_in_executor(self.executor, _ready) for _ in range(self.workers)))
+
+    async def parse(self, cards, min_cards: int = MIN_POOL_CARDS) -> list:
+        """parse_cards() over harvested {'text', 'stars'} cards, in order;
+        fewer than min_cards are parsed inline"""
+        pairs = [(card.get('text') or '', card.get('stars')) for card in cards]
+        if len(pairs) < min_cards:
+            return parse_cards(pairs)
+        await self.start()
+        loop = asyncio.get_running_loop()
+        batches = await asyncio.gather(*(
+            loop.run_in_executor(self.executor, parse_cards, pairs[i:i + self.batch_size])
+            for i in range(0, len(pairs), self.batch_size)
+        ))
+        return [result for batch in batches for result in batch]
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
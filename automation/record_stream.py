@@ -0,0 +1,136 @@
+"""
+Record Stream
+Appends each scraped record to an NDJSON file as soon as it is extracted,
+so a crash keeps everything collected so far and a run can be tailed live;
+compact() folds a stream into the scraped_data_*.json snapshot
+
+Lines are {"kind": "reviews"|"posts"|"images", "record": {...}} (the same
+key again supersedes the earlier copy), {"kind": "run"|"metadata",
+"record": {...}} merged field by field, and {"kind": ..., "reset": true},
+which drops every earlier record of that kind.
+
+Usage (e.g. to recover a crashed run):
+  python record_stream.py output/scraped_data_20250101_120000.ndjson
+"""
+import json
+import os
+import sys
+from pathlib import Path
+
+from records import to_json
+from seen_index import KINDS, record_key
+
+# Snapshot key order, as written by the scraper
+SNAPSHOT_KINDS = ('reviews', 'images', 'posts')
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False, default=to_json)
+
+class RecordStream:
+    """Line-per-record writer, flushed every `batch_size` records and per phase"""
+
+    def __init__(self, path, batch_size: int = 25):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = max(1, batch_size)
+        self.file = open(self.path, 'a', encoding='utf-8')
+        self.bytes_written = 0
+        self._pending = 0
+
+    def _write(self, entry: dict):
+        line = _dumps(entry) + '\n'
+        self.file.write(line)
+        self.bytes_written += len(line.encode('utf-8'))
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.flush()
+
+    def append(self, kind: str, record: dict):
+        self._write({'kind': kind, 'record': record})
+
+    def replace(self, kind: str, records: list):
+        """Supersede everything streamed for `kind` (after dedupe/merge rewrote the list)"""
+        self._write({'kind': kind, 'reset': True})
+        for record in records:
+            self.append(kind, record)
+        self.flush()
+
+    def flush(self):
+        if self._pending:
+            self.file.flush()
+            self._pending = 0
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+def compact(stream_path, output_path) -> int:
+    """Fold a stream into a snapshot JSON file; returns the bytes written
+
+    Two passes over the file - only keys and line offsets are held in
+    memory, never every record at once. A torn last line from a crash is
+    ignored.
+    """
+    stream_path, output_path = Path(stream_path), Path(output_path)
+    header = {}
+    metadata = {}
+    offsets = {kind: {} for kind in KINDS}  # kind -> key -> offset of the latest line
+
+    with open(stream_path, 'rb') as f:
+        line_no = 0
+        while True:
+            offset = f.tell()
+            line = f.readline()
+            if not line:
+                break
+            line_no += 1
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            kind = entry.get('kind')
+            if kind == 'run':
+                header.update(entry['record'])
+            elif kind == 'metadata':
+                metadata.update(entry['record'])
+            elif kind in offsets:
+                if entry.get('reset'):
+                    offsets[kind].clear()
+                else:
+                    key = record_key(kind, entry['record']) or f'#{line_no}'
+                    offsets[kind][key] = offset
+
+    tmp_path = output_path.with_suffix('.tmp')
+    written = 0
+    with open(stream_path, 'rb') as stream, open(tmp_path, 'w', encoding='utf-8') as out:
+        def write(text):
+            nonlocal written
+            out.write(text)
+            written += len(text.encode('utf-8'))
+
+        write('{\n' + ',\n'.join(f'  {_dumps(field)}: {_dumps(header.get(field))}'
+                                  for field in ('business_name', 'scraped_at', 'page_url')))
+        for kind in SNAPSHOT_KINDS:
+            write(f',\n  "{kind}": [')
+            for index, offset in enumerate(offsets[kind].values(), 1):
+                stream.seek(offset)
+                record = json.loads(stream.readline())['record']
+                record['index'] = index
+                write(f'{"," if index > 1 else ""}\n    {_dumps(record)}')
+            write('\n  ]' if offsets[kind] else ']')
+        write(f',\n  "metadata": {_dumps(metadata)}\n}}\n')
+    os.replace(tmp_path, output_path)
+    return written
+
+def main(path):
+    stream_path = Path(path)
+    output_path = stream_path.with_suffix('.json')
+    written = compact(stream_path, output_path)
+    print(f"[OK] Compacted {stream_path} -> {output_path} ({written / 1024:.1f} KiB)")
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print(__doc__)
+        sys.exit(1)
+    main(sys.argv[1])
@@ -0,0 +1,110 @@
+"""
+Scraped Record Types
+Slotted record classes for reviews, posts, images and page metadata that
+serialise to the existing scraped_data_*.json shape
+
+Records behave as mutable mappings over their JSON fields, so code that
+reads or annotates plain dict records (merges, the image pipeline, dedupe
+keys) handles both. Reviews and posts keep one copy of their text; the
+500-character 'text' preview is derived when serialised.
+"""
+from collections.abc import MutableMapping
+
+TEXT_PREVIEW = 500
+
+class Record(MutableMapping):
+    """Base for slotted records; FIELDS is the JSON key order and fields
+    left as None are omitted"""
+    __slots__ = ()
+    FIELDS = ()
+
+    def __getitem__(self, field):
+        value = getattr(self, field, None) if field in self.FIELDS else None
+        if value is None:
+            raise KeyError(field)
+        return value
+
+    def __setitem__(self, field, value):
+        if field not in self.__slots__:
+            raise KeyError(f"{type(self).__name__} has no field {field!r}")
+        setattr(self, field, value)
+
+    def __delitem__(self, field):
+        self[field]  # KeyError for unset/unknown fields
+        setattr(self, field, None)
+
+    def __iter__(self):
+        return (field for field in self.FIELDS if getattr(self, field) is not None)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def to_dict(self) -> dict:
+        data = {}
+        for field in self.FIELDS:
+            value = getattr(self, field)
+            if value is not None:
+                data[field] = value
+        return data
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+class _TextRecord(Record):
+    __slots__ = ()
+
+    @property
+    def text(self) -> str:
+        return self.full_text[:TEXT_PREVIEW]
+
+class Review(_TextRecord):
+    __slots__ = ('index', 'key', 'full_text', 'author', 'rating', 'extracted_at')
+    FIELDS = ('index', 'key', 'text', 'full_text', 'author', 'rating', 'extracted_at')
+
+    def __init__(self, index: int, key: str, full_text: str, author: str, rating: int, extracted_at: str):
+        self.index = index
+        self.key = key
+        self.full_text = full_text
+        self.author = author
+        self.rating = rating
+        self.extracted_at = extracted_at
+
+class Post(_TextRecord):
+    __slots__ = ('index', 'key', 'full_text')
+    FIELDS = ('index', 'key', 'text', 'full_text')
+
+    def __init__(self, index: int, key: str, full_text: str):
+        self.index = index
+        self.key = key
+        self.full_text = full_text
+
+class Image(Record):
+    __slots__ = ('index', 'key', 'url', 'alt', 'source', 'local_path', 'sha256', 'variants', 'dhash', 'alias_urls')
+    FIELDS = __slots__
+
+    def __init__(self, index: int, key: str, url: str, alt: str = '', source: str = 'facebook'):
+        self.index = index
+        self.key = key
+        self.url = url
+        self.alt = alt
+        self.source = source
+        # Filled in by image capture, the image pipeline and perceptual dedupe
+        self.local_path = None
+        self.sha256 = None
+        self.variants = None
+        self.dhash = None
+        self.alias_urls = None
+
+class PageMetadata(Record):
+    __slots__ = ('name', 'about', 'rating', 'phone', 'email')
+    FIELDS = __slots__
+
+    def __init__(self):
+        for field in self.__slots__:
+            setattr(self, field, None)
+
+def to_json(value):
+    """json.dump(s) default= hook for records"""
+    if isinstance(value, Record):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
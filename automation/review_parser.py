@@ -0,0 +1,168 @@
+"""
+Review Card Parser
+Turns the raw inner text of a Facebook review card into a ReviewRecord
+Pure text processing - no browser needed, so it can be fed card texts
+from a live scrape, a saved snapshot or a fixture file
+"""
+import json
+import re
+import sys
+import time
+from dataclasses import dataclass
+
+MONTHS = ('January', 'February', 'March', 'April', 'May', 'June', 'July',
+          'August', 'September', 'October', 'November', 'December')
+_MONTH_NAMES = '|'.join(MONTHS)
+
+# All patterns are compiled once at import time
+_MONTH = re.compile(_MONTH_NAMES)
+_RECOMMENDS = re.compile(r'\brecommends\b', re.IGNORECASE)
+# "Stef Candea recommends Elite Painting." - author is the text before it
+_AUTHOR = re.compile(r'^[ \t]*([^\n]{1,49}?)[ \t]+recommends\b[^\n]*\belite\b', re.IGNORECASE | re.MULTILINE)
+# Date line under the header: "March 3, 2023", "3y", "35w"
+_DATE_LINE = re.compile(rf'\b\d{{4}}\b|^\s*\d+[smhdwy]\s*$|\b(?:{_MONTH_NAMES})\s+\d{{1,2}}\b', re.IGNORECASE)
+_FULL_DATE = re.compile(rf'\b(?:{_MONTH_NAMES})\s+\d{{1,2}},\s+\d{{4}}\b', re.IGNORECASE)
+# Body ends at the reactions bar, a bare Like/Comment/Share action line,
+# or the business's reply (its author line - the name alone, not a
+# sentence that starts with it)
+_BODY_END = re.compile(r'^\s*(?:All reactions:|(?:Elite Painting|Like|Comment|Share)\s*$)', re.IGNORECASE)
+# Single-pass cleanup: See more/less links, relative timestamps and
+# reaction counts ("35w", "3y"), and any leftover full dates
+_NOISE = re.compile(
+    rf'…?\s*See (?:more|less)\b|\b\d+[wy]\b|\b(?:{_MONTH_NAMES})\s+\d{{1,2}},\s+\d{{4}}\b',
+    re.IGNORECASE
+)
+_SKIP = re.compile(r'Send message|All reactions:|Like|Comment|Share|Elite Painting\nJanuary')
+_RATING = re.compile(r'(\d+)')
+
+MIN_CARD_LENGTH = 50
+MIN_TEXT_LENGTH = 20
+MIN_REVIEW_LENGTH = 15
+
+@dataclass
+class ReviewRecord:
+    author: str
+    text: str
+    rating: int = 5
+    has_stars: bool = False
+
+def is_review_card(text: str) -> bool:
+    """Cheap filter for [role="article"] cards on the /reviews tab"""
+    if not text or len(text) < MIN_CARD_LENGTH:
+        return False
+
+    # Must contain "recommends Elite Painting" pattern to be a review
+    lower = text.lower()
+    if 'recommends' not in lower or 'elite painting' not in lower:
+        return False
+
+    # Skip if it's the header/overview (contains "100% recommend" or follower count)
+    if '100% recommend' in text or 'followers' in text or 'following' in text:
+        return False
+
+    # Skip if it's just the business response (starts with "Elite Painting" and is short)
+    if len(text) < 200 and text.split('\n', 1)[0].strip() == 'Elite Painting':
+        return False
+
+    return True
+
+def rating_from_stars(stars):
+    """(has_stars, rating) from the star markup HARVEST_CARDS_JS found in a card"""
+    if not stars:
+        return False, 5
+
+    aria_label = stars.get('aria_label')
+    if aria_label:
+        # Extract number from aria-label like "5 out of 5 stars"
+        match = _RATING.search(aria_label)
+        return True, int(match.group(1)) if match else 5
+
+    # Count stars in text
+    star_text = stars.get('text') or ''
+    return True, (star_text.count('★') + star_text.count('⭐')) or 5
+
+def _looks_like_review(text: str, has_stars: bool) -> bool:
+    if 'recommends' in text.lower():
+        return True
+
+    # Skip if it's clearly a post (has date patterns like "January 2 at 1:08 PM")
+    if not has_stars and 'star' not in text.lower() and _MONTH.search(text):
+        if 'at' in text and ('PM' in text or 'AM' in text):
+            return False
+
+    # Skip obvious non-review content
+    return not _SKIP.search(text)
+
+def _body_lines(lines):
+    """Lines between the header/date block and the reactions bar or reply"""
+    start = next((i + 1 for i, line in enumerate(lines) if _RECOMMENDS.search(line)), None)
+    if start is None:
+        # No "recommends" header - start after the first full date instead
+        start = next((i + 1 for i, line in enumerate(lines) if _FULL_DATE.search(line)), 0)
+    elif start < len(lines) and _DATE_LINE.search(lines[start]):
+        start += 1
+
+    # Skip the "·" separator and blank lines
+    while start < len(lines) and lines[start].strip() in ('', '·'):
+        start += 1
+
+    end = start
+    while end < len(lines) and not _BODY_END.match(lines[end]):
+        end += 1
+    return lines[start:end]
+
+def parse_review(text: str, stars=None):
+    """Parse one card's inner text, or return None if it is not a usable review"""
+    if not text or len(text) < MIN_TEXT_LENGTH:
+        return None
+
+    has_stars, rating = rating_from_stars(stars)
+    if not _looks_like_review(text, has_stars):
+        return None
+
+    match = _AUTHOR.search(text)
+    author = match.group(1).strip() if match else 'Customer'
+
+    body = '\n'.join(_body_lines(text.strip().split('\n')))
+    review_text = ' '.join(_NOISE.sub(' ', body).split())
+
+    # Be lenient - accept shorter reviews and don't filter out questions
+    if len(review_text) <= MIN_REVIEW_LENGTH:
+        return None
+
+    return ReviewRecord(author=author, text=review_text, rating=rating, has_stars=has_stars)
+
+def parse_reviews(cards):
+    """Parse many cards - plain strings or harvested {'text', 'stars'} dicts
+
+    Cards that fail is_review_card() are skipped, as the scraper skips them.
+    """
+    records = []
+    for card in cards:
+        text, stars = (card, None) if isinstance(card, str) else (card.get('text'), card.get('stars'))
+        if not is_review_card(text):
+            continue
+        record = parse_review(text, stars)
+        if record:
+            records.append(record)
+    return records
+
+def main(path):
+    """Parse a JSON list of raw card texts (or harvested card dicts) and report timing"""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+
+    started = time.perf_counter()
+    records = parse_reviews(data)
+    elapsed = time.perf_counter() - started
+
+    for record in records:
+        print(f"  [OK] {record.author} ({record.rating}) - {record.text[:60]}...")
+    print(f"[OK] Parsed {len(records)}/{len(data)} cards in {elapsed * 1000:.1f} ms "
+          f"({elapsed / max(len(data), 1) * 1e6:.1f} us/card)")
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python review_parser.py <cards.json>")
+        sys.exit(1)
+    main(sys.argv[1])
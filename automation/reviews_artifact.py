@@ -0,0 +1,128 @@
+"""
+Reviews Artifact
+Precomputes what /api/reviews serves - filtered, whitespace-cleaned and
+project-classified reviews - as output/reviews.json, with gzip (and, when
+the optional brotli package is installed, brotli) variants and a
+reviews.meta.json holding the content-hash ETag
+
+The transform mirrors the fallback in app/api/reviews/route.ts; keep the
+two in step.
+
+Usage:
+  python reviews_artifact.py [output/scraped_data_latest.json]
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+OUTPUT_DIR = Path(__file__).parent / "output"
+
+MIN_TEXT_LENGTH = 20
+DEFAULT_LOCATION = 'Northern Michigan'
+
+# First matching keyword wins, in this order
+PROJECT_KEYWORDS = (
+    (('cabin', 'exterior'), 'Exterior Painting'),
+    (('fence',), 'Fence Staining'),
+    (('interior', 'walls'), 'Interior Painting'),
+    (('cabinet',), 'Cabinet Refinishing'),
+    (('house',), 'Exterior Painting'),
+)
+DEFAULT_PROJECT = 'Painting Project'
+
+_WHITESPACE = re.compile(r'\s+')
+
+def classify_project(text: str) -> str:
+    lowered = text.lower()
+    for keywords, project in PROJECT_KEYWORDS:
+        if any(keyword in lowered for keyword in keywords):
+            return project
+    return DEFAULT_PROJECT
+
+def build_payload(data: dict) -> dict:
+    """The /api/reviews response body for a scraped_data_*.json snapshot"""
+    reviews = []
+    for review in data.get('reviews') or []:
+        text = review.get('text') or review.get('full_text') or ''
+        if len(text) <= MIN_TEXT_LENGTH:
+            continue
+        clean_text = _WHITESPACE.sub(' ', text).strip()
+        rating = review.get('rating')
+        reviews.append({
+            'id': len(reviews) + 1,
+            'text': clean_text,
+            'author': review.get('author') or review.get('name') or 'Customer',
+            'location': review.get('location') or DEFAULT_LOCATION,
+            'project': review.get('project') or classify_project(clean_text),
+            'rating': rating if isinstance(rating, (int, float)) and not isinstance(rating, bool) else 5,
+            'date': review.get('date') or review.get('timestamp') or review.get('extracted_at') or ''
+        })
+    return {'reviews': reviews}
+
+def _write(path: Path, data: bytes):
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def write_artifact(snapshot_file, output_dir=OUTPUT_DIR, name: str = 'reviews') -> dict:
+    """Build <name>.json (+ .gz/.br) from a snapshot; returns the meta record
+
+    Nothing is rewritten when the content hash matches the current meta, so
+    the ETag and file times only change with the reviews themselves.
+    """
+    output_dir = Path(output_dir)
+    with open(snapshot_file, encoding='utf-8') as f:
+        payload = build_payload(json.load(f))
+    body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+    meta_file = output_dir / f'{name}.meta.json'
+    if meta_file.exists():
+        with open(meta_file, encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('etag') == etag and (output_dir / f'{name}.json').exists():
+            return meta
+
+    meta = {
+        'etag': etag,
+        'count': len(payload['reviews']),
+        'generated_at': datetime.now().isoformat(),
+        'encodings': {'identity': f'{name}.json'},
+        'bytes': {'identity': len(body)}
+    }
+    _write(output_dir / f'{name}.json', body)
+
+    # mtime=0 keeps the gzip bytes a pure function of the body
+    variants = {'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['br'] = brotli.compress(body, quality=11)
+    for encoding, data in variants.items():
+        file_name = f'{name}.json.{"gz" if encoding == "gzip" else encoding}'
+        _write(output_dir / file_name, data)
+        meta['encodings'][encoding] = file_name
+        meta['bytes'][encoding] = len(data)
+
+    # Meta last - the route reloads when it changes, by which point every
+    # file it names is in place
+    _write(meta_file, json.dumps(meta, indent=2).encode('utf-8'))
+    return meta
+
+def main(path=None):
+    snapshot_file = Path(path) if path else OUTPUT_DIR / 'scraped_data_latest.json'
+    meta = write_artifact(snapshot_file, snapshot_file.parent)
+    sizes = ', '.join(f"{encoding} {size / 1024:.1f} KiB" for encoding, size in meta['bytes'].items())
+    print(f"[OK] Reviews artifact: {meta['count']} reviews, ETag {meta['etag']} ({sizes})")
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
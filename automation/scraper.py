@@ -2,23 +2,502 @@
 Facebook Business Page Scraper
 Extracts reviews, images, and metadata from public Facebook pages
 NO AUTHENTICATION REQUIRED - Works with public pages only
+
+Playwright is imported where a browser is started, and .env is loaded by
+main(), so importing this module (cli.py, tools) stays cheap.
 """
 import asyncio
 import json
 import os
 import re
+import shutil
 from datetime import datetime
 from pathlib import Path
-from playwright.async_api import async_playwright
-from dotenv import load_dotenv
-
-load_dotenv()
+from urllib.parse import urlparse
+from metrics import (BYTES_WRITTEN, IPC_CALLS, IPC_CALLS_PER_ELEMENT, ITEMS_FOUND, ITEMS_KEPT,
+                     TIMEOUTS, RunMetrics)
+from record_stream import RecordStream, compact
+from records import Image, PageMetadata, Post, Review, to_json
+from reviews_artifact import write_artifact
+from parse_pool import MIN_POOL_CARDS, ParsePool, card_key, parse_cards
+from review_parser import is_review_card, parse_review
+from seen_index import KINDS, SeenIndex, image_key, item_key, record_key
+from selector_cache import PROBE_SELECTORS_JS, SelectorCache
 
 OUTPUT_DIR = Path(__file__).parent / "output"
+HAR_DIR = Path(__file__).parent / "har"
+HAR_MODES = ('record', 'replay')
+
+# In-page harvesters - each returns a whole phase's worth of data in ONE
+# page.evaluate round-trip instead of one Playwright call per element.
+#
+# Fallback selectors are matched with one compound query and resolved in
+# the (cache-ranked) order given; the winner is reported back so
+# SelectorCache can rank it first next run.
+HARVEST_METADATA_JS = """
+(aboutSelectors) => {
+    const text = (el) => el ? (el.innerText || '').trim() : '';
+    const meta = {};
+    meta.name = text(document.querySelector('h1'));
+    const aboutHits = Array.from(document.querySelectorAll(aboutSelectors.join(', ')));
+    for (const selector of aboutSelectors) {
+        const about = text(aboutHits.find(el => el.matches(selector) && text(el)));
+        if (about) { meta.about = about; meta.about_selector = selector; break; }
+    }
+    const rating = Array.from(document.querySelectorAll('span'))
+        .map(text)
+        .find(t => t.includes('★'));
+    if (rating) meta.rating = rating;
+    meta.phone = text(document.querySelector('a[href^="tel:"]'));
+    const mail = document.querySelector('a[href^="mailto:"]');
+    meta.email = mail ? mail.getAttribute('href') : '';
+    return meta;
+}
+"""
+
+# Builds the card reader shared by HARVEST_CARDS_JS and the scroll collector:
+# text, aria-labels, first star marker and images of one card element
+CARD_READER_JS = """
+(starProbes) => {
+    // 'sel:contains(text)' probes also need the text - see selector_cache.py
+    const probes = starProbes.map(probe => {
+        const m = probe.match(/^(.*):contains\\((.*)\\)$/);
+        return m ? [probe, m[1], m[2]] : [probe, probe, null];
+    });
+    const starQuery = Array.from(new Set(probes.map(([, sel]) => sel))).join(', ');
+    const findStars = (card) => {
+        const hits = Array.from(card.querySelectorAll(starQuery));
+        if (!hits.length) return null;
+        for (const [probe, sel, marker] of probes) {
+            const el = hits.find(e => e.matches(sel) && (marker === null || (e.innerText || '').includes(marker)));
+            if (el) {
+                return {
+                    aria_label: el.getAttribute('aria-label') || '',
+                    text: el.innerText || '',
+                    probe
+                };
+            }
+        }
+        return null;
+    };
+    return (card, text = card.innerText || '') => ({
+        text,
+        aria_labels: Array.from(card.querySelectorAll('[aria-label]'))
+            .map(el => el.getAttribute('aria-label')),
+        stars: findStars(card),
+        images: Array.from(card.querySelectorAll('img'))
+            .map(img => ({src: img.getAttribute('src') || '', alt: img.getAttribute('alt') || ''}))
+    });
+}
+"""
+
+HARVEST_CARDS_JS = """
+([selector, limit, starProbes]) => {
+    const readCard = (""" + CARD_READER_JS + """)(starProbes);
+    const all = Array.from(document.querySelectorAll(selector));
+    const cards = limit ? all.slice(0, limit) : all;
+    return {total: all.length, cards: cards.map(card => readCard(card))};
+}
+"""
+
+# Card collector for virtualized feeds. A MutationObserver queues every card
+# as it mounts; each scroll step drains the queue (see SCROLL_STEP_JS), so
+# cards are read while they are still in the DOM rather than after the
+# scroll, when Facebook may already have unmounted the early ones. Cards are
+# keyed by their permalink (or feed position) so a remounted card is not
+# read twice; cards with no such id are deduped on text by the caller.
+# Cards still empty (skeletons) stay queued until they render.
+#
+# With prune, cards read in an earlier drain are swapped for empty
+# placeholders of the same height, so the document (and the layout every
+# scrollTo triggers) stops growing with the feed. The newest cards are kept
+# so the feed's own load-more logic still sees real content at the bottom.
+START_COLLECTOR_JS = """
+([selector, starProbes, prune]) => {
+    const readCard = (""" + CARD_READER_JS + """)(starProbes);
+    const stableId = (card) => {
+        const link = card.querySelector(
+            'a[href*="/posts/"], a[href*="/permalink"], a[href*="story_fbid="], a[href*="/videos/"]');
+        if (link) {
+            const url = new URL(link.href, location.href);
+            const fbid = url.searchParams.get('story_fbid');
+            return fbid ? 'story:' + fbid : 'path:' + url.pathname;
+        }
+        const position = card.getAttribute('aria-posinset');
+        return position ? 'pos:' + position : null;
+    };
+    if (window.__scraperCollector) window.__scraperCollector.observer.disconnect();
+    const pending = new Set(document.querySelectorAll(selector));
+    const seen = new Set();
+    let readEarlier = [];
+    let pruned = 0;
+    const pruneCard = (card) => {
+        if (!card.isConnected) return;
+        const placeholder = document.createElement('div');
+        placeholder.style.height = card.offsetHeight + 'px';
+        placeholder.style.contain = 'strict';
+        placeholder.dataset.scraperPruned = '';
+        card.replaceWith(placeholder);
+        pruned += 1;
+    };
+    const observer = new MutationObserver(records => {
+        for (const record of records) {
+            for (const node of record.addedNodes) {
+                if (node.nodeType !== Node.ELEMENT_NODE) continue;
+                if (node.matches(selector)) pending.add(node);
+                node.querySelectorAll(selector).forEach(el => pending.add(el));
+            }
+        }
+    });
+    observer.observe(document.body, {childList: true, subtree: true});
+    window.__scraperCollector = {
+        observer,
+        pruned: () => pruned,
+        drain(final = false) {
+            const cards = [];
+            const read = [];
+            for (const card of Array.from(pending)) {
+                if (!card.isConnected) { pending.delete(card); continue; }
+                const text = card.innerText || '';
+                if (!text.trim()) continue;
+                pending.delete(card);
+                read.push(card);
+                const id = stableId(card);
+                if (id) {
+                    if (seen.has(id)) continue;
+                    seen.add(id);
+                }
+                cards.push(Object.assign({id}, readCard(card, text)));
+            }
+            if (prune && !final) {
+                // Only after the loop: nested cards read above must not be
+                // detached before their turn
+                readEarlier.forEach(pruneCard);
+                readEarlier = read;
+            }
+            return cards;
+        }
+    };
+    return [document.querySelectorAll(selector).length, document.body.scrollHeight];
+}
+"""
+
+# Last drain of the collector, then tear it down
+STOP_COLLECTOR_JS = """
+() => {
+    const collector = window.__scraperCollector;
+    if (!collector) return {cards: [], pruned: 0};
+    delete window.__scraperCollector;
+    collector.observer.disconnect();
+    return {cards: collector.drain(true), pruned: collector.pruned()};
+}
+"""
+
+ABOUT_SELECTORS = (
+    'div[data-ad-comet-preview="message"]',
+    'div[data-testid="about_text"]',
+    'div.x1y1aw1k.xn6708d.xwib8y2.x1ye3gou'
+)
+STAR_PROBES = (
+    'span[aria-label*="star"]',
+    'span[aria-label*="Star"]',
+    'span:contains(★)',
+    'span:contains(⭐)',
+    'div[aria-label*="star"]',
+    'div[aria-label*="Star"]'
+)
+# Review containers to try when no [role="article"] card reads as a review
+REVIEW_FALLBACK_SELECTORS = (
+    'div[role="article"]',
+    'div[data-pagelet]',
+    'div[class*="review"]',
+    'div[class*="Review"]',
+    'span[dir="auto"]',
+    'div.x1n2onr6'  # Another common Facebook container class
+)
+
+# Text (or one attribute) of every item from index `start` on - used to key
+# newly mounted items while scrolling
+HARVEST_KEYS_JS = """
+([selector, start, attr]) => Array.from(document.querySelectorAll(selector))
+    .slice(start)
+    .map(el => attr ? (el.getAttribute(attr) || '') : (el.innerText || ''))
+"""
+
+HARVEST_IMAGES_JS = """
+(selector) => Array.from(document.querySelectorAll(selector)).map(img => ({
+    src: img.getAttribute('src') || '',
+    alt: img.getAttribute('alt') || ''
+}))
+"""
+
+# One scroll step: scroll to the bottom, then resolve as soon as new items
+# mount or the document grows instead of sleeping for a fixed interval. A
+# feed XHR/fetch landing only gives the page `grace` ms more to render what
+# it fetched (Facebook polls graphql constantly, so a request alone is not
+# progress). Cards the collector (START_COLLECTOR_JS) queued meanwhile come
+# back with the step.
+SCROLL_STEP_JS = """
+([selector, count, height, timeout, grace]) => new Promise(resolve => {
+    let settled = false;
+    let frame = null;
+    let graceTimer = null;
+    const snapshot = () => ({
+        count: document.querySelectorAll(selector).length,
+        height: document.body.scrollHeight
+    });
+    const finish = (reason) => {
+        if (settled) return;
+        settled = true;
+        observer.disconnect();
+        feed.disconnect();
+        clearTimeout(timer);
+        clearTimeout(graceTimer);
+        const collector = window.__scraperCollector;
+        resolve(Object.assign({reason, cards: collector ? collector.drain() : []}, snapshot()));
+    };
+    const check = () => {
+        frame = null;
+        const now = snapshot();
+        if (now.count > count || now.height > height) finish('dom');
+    };
+    const observer = new MutationObserver(() => {
+        if (frame === null) frame = requestAnimationFrame(check);
+    });
+    observer.observe(document.body, {childList: true, subtree: true});
+    const feed = new PerformanceObserver(list => {
+        const landed = list.getEntries().some(e =>
+            (e.initiatorType === 'xmlhttprequest' || e.initiatorType === 'fetch') &&
+            /graphql|\\/ajax\\//.test(e.name));
+        if (landed && graceTimer === null) graceTimer = setTimeout(() => finish('xhr'), grace);
+    });
+    feed.observe({type: 'resource'});
+    const timer = setTimeout(() => finish('timeout'), timeout);
+    window.scrollTo(0, document.body.scrollHeight);
+    check();
+})
+"""
+
+# Per-phase scroll stop conditions: whichever of max_scrolls, item_target
+# (items matched by the phase's selector) or time_budget (seconds) is hit
+# first ends the scroll. stall_limit consecutive steps with no new items
+# and no height growth also end it, once they add up to at least
+# step_timeout_ms - a step that saw a feed request returns after the XHR
+# grace, so short steps alone never count as a stall. In incremental mode,
+# known_run consecutive already-stored items end it too.
+DEFAULT_SCROLL_LIMITS = {
+    'posts': {'max_scrolls': 15, 'item_target': None, 'time_budget': 60, 'known_run': 5},
+    'reviews': {'max_scrolls': 10, 'item_target': None, 'time_budget': 45, 'known_run': 5},
+    'photos': {'max_scrolls': 15, 'item_target': None, 'time_budget': 60, 'known_run': 10},
+    'photos_fallback': {'max_scrolls': 5, 'item_target': None, 'time_budget': 15},
+}
+SCROLL_STEP_TIMEOUT_MS = 4000
+SCROLL_XHR_GRACE_MS = 750
+SCROLL_STALL_LIMIT = 2
+# Posts kept from the collected main feed cards
+POST_CARD_LIMIT = 30
+
+# Navigations wait for DOM content plus the first element the view needs,
+# never networkidle (Facebook polls forever). Each navigation and scroll
+# phase gets its own budget plus whatever earlier phases left unused, up
+# to MAX_SPARE_S.
+NAV_BUDGET_S = 30
+MAIN_READY_SELECTOR = 'h1, [role="article"]'
+REVIEWS_READY_SELECTOR = '[role="article"]'
+PHOTOS_READY_SELECTOR = 'img[src*="scontent"]'
+REDIRECT_WAIT_MS = 2000
+MAX_SPARE_S = 60
+
+# Requests the scraper never reads. Images are stubbed rather than aborted:
+# we only need their src attributes, and a stub keeps the page's own
+# load/error handlers quiet while skipping the bytes.
+DEFAULT_RESOURCE_POLICY = {
+    'stub_types': ['image'],
+    'block_types': ['media', 'font', 'texttrack', 'eventsource', 'manifest'],
+    'block_patterns': [
+        r'facebook\.com/tr[/?]',
+        r'/ajax/bz',
+        r'/ajax/bulk-route-definitions',
+        r'/logging/',
+        r'connect\.facebook\.net/.*/fbevents',
+        r'google-analytics\.com',
+        r'googletagmanager\.com',
+        r'doubleclick\.net',
+        r'\.(mp4|webm|m3u8|woff2?|ttf|otf)(\?|$)',
+    ]
+}
+
+# Rough transfer sizes used to estimate bytes saved - aborted requests
+# never report a real size
+TYPICAL_RESOURCE_BYTES = {
+    'image': 60_000,
+    'media': 1_500_000,
+    'font': 40_000,
+    'script': 30_000,
+    'xhr': 2_000,
+    'fetch': 2_000,
+    'other': 1_000
+}
+
+# 1x1 transparent GIF served in place of stubbed images
+STUB_GIF = bytes.fromhex('47494638396101000100800000000000ffffff21f90401000000002c00000000010001000002024401003b')
+
+class ResourceFilter:
+    """Context-wide request router that blocks or stubs resources we never use"""
+    
+    def __init__(self, policy: dict = None):
+        policy = DEFAULT_RESOURCE_POLICY if policy is None else policy
+        self.stub_types = set(policy.get('stub_types', []))
+        self.block_types = set(policy.get('block_types', []))
+        self.block_patterns = [re.compile(p, re.IGNORECASE) for p in policy.get('block_patterns', [])]
+        # URLs matching these always go to the network, whatever their type
+        self.pass_patterns = [re.compile(p, re.IGNORECASE) for p in policy.get('pass_patterns', [])]
+        self.stats = {
+            'allowed': 0,
+            'stubbed': {},
+            'blocked': {},
+            'bytes_received': 0,
+            'est_bytes_saved': 0
+        }
+    
+    async def install(self, context):
+        await context.route('**/*', self._handle)
+        context.on('response', self._on_response)
+    
+    async def _handle(self, route):
+        request = route.request
+        resource_type = request.resource_type
+        
+        if any(p.search(request.url) for p in self.pass_patterns):
+            self.stats['allowed'] += 1
+            await route.fallback()
+        elif resource_type in self.stub_types:
+            self._count('stubbed', resource_type)
+            await route.fulfill(status=200, content_type='image/gif', body=STUB_GIF)
+        elif resource_type in self.block_types or any(p.search(request.url) for p in self.block_patterns):
+            self._count('blocked', resource_type)
+            await route.abort()
+        else:
+            self.stats['allowed'] += 1
+            # fallback() rather than continue_() so later route handlers
+            # registered on the context still see the request
+            await route.fallback()
+    
+    def _count(self, action, resource_type):
+        counts = self.stats[action]
+        counts[resource_type] = counts.get(resource_type, 0) + 1
+        self.stats['est_bytes_saved'] += TYPICAL_RESOURCE_BYTES.get(resource_type, TYPICAL_RESOURCE_BYTES['other'])
+    
+    def _on_response(self, response):
+        if response.request.resource_type in self.stub_types and not any(
+                p.search(response.url) for p in self.pass_patterns):
+            return
+        try:
+            self.stats['bytes_received'] += int(response.headers.get('content-length', 0))
+        except ValueError:
+            pass
+    
+    def summary(self):
+        saved = sum(self.stats['stubbed'].values()) + sum(self.stats['blocked'].values())
+        return (f"{saved} requests skipped ({self.stats['stubbed']} stubbed, {self.stats['blocked']} blocked), "
+                f"{self.stats['allowed']} allowed, {self.stats['bytes_received'] / 1e6:.1f} MB received, "
+                f"~{self.stats['est_bytes_saved'] / 1e6:.1f} MB saved (est.)")
+
+async def launch_browser(p):
+    """Launch Chromium without session file (public scraping)"""
+    return await p.chromium.launch(
+        headless=True,
+        args=[
+            '--disable-blink-features=AutomationControlled',
+            '--disable-dev-shm-usage',
+            '--no-sandbox'
+        ]
+    )
+
+async def new_context(browser):
+    """Fresh, isolated browser context - cookies and storage are per page"""
+    return await browser.new_context(
+        viewport={'width': 1920, 'height': 1080},
+        user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        locale='en-US',
+        timezone_id='America/New_York'
+    )
+
+def page_slug(page_url: str) -> str:
+    """File-name-safe name for a page URL, e.g. 'udebrockfinishes'"""
+    parsed = urlparse(page_url.strip())
+    # profile.php?id=... pages differ only in the query string
+    name = f"{parsed.path} {parsed.query}" if parsed.path else page_url
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or 'page'
 
 class UdebrockScraper:
-    def __init__(self, page_url: str):
+    def __init__(self, page_url: str, scroll_limits: dict = None, parallel: bool = False,
+                 concurrency: int = 3, output_name: str = None, resource_policy=None,
+                 incremental: bool = False, har_mode: str = None, har_path=None,
+                 download_images: bool = False, capture_images: bool = False,
+                 perceptual_dedupe: bool = False, store: bool = False, stream: bool = False,
+                 prune_dom: bool = False, parse_workers: int = 0, parse_pool: ParsePool = None,
+                 near_dedupe: bool = True):
         self.page_url = page_url.strip()
+        # capture_images=True stores CDN image bodies straight from the
+        # browser's responses, so results point at local files
+        self.capture_images = capture_images
+        self.image_capture = None
+        # download_images=True runs the collected URLs through the image
+        # pipeline (pooled downloads + WebP variants) before saving
+        self.download_images = download_images
+        # perceptual_dedupe=True collapses visually identical images (other
+        # signed URL or size of the same photo) using the local bytes from
+        # capture/download, against a hash index kept across runs
+        self.perceptual_dedupe = perceptual_dedupe
+        # near_dedupe=True folds reviews/posts whose opening words nearly
+        # match (truncated vs expanded, feed copies of reviews) into one
+        # entry keeping the longest text, against a MinHash index kept
+        # across runs
+        self.near_dedupe = near_dedupe
+        # store=True upserts every run into output/scraper.db (run history,
+        # first_seen/last_seen per item) and exports the latest JSON from it
+        # instead of writing a full timestamped copy per run
+        self.store = store
+        self.scrape_store = None
+        self.run_id = None
+        # stream=True appends every record to an NDJSON file as it is
+        # extracted (flushed per batch and per phase), so a crash keeps what
+        # was collected; the snapshot is compacted from it at the end
+        self.stream = stream
+        self.record_stream = None
+        # prune_dom=True swaps feed cards for same-height placeholders once
+        # they are collected, keeping long scrolls flat in memory and layout
+        # cost - raise the scroll limits with it to reach older items. Only
+        # collected cards are pruned, so anything read from cards (text,
+        # stars, images) must come from the collector, not the DOM afterwards
+        self.prune_dom = prune_dom
+        # Review cards are filtered, keyed and parsed on a process pool:
+        # parse_pool is one shared across pages (batch/daemon), parse_workers
+        # starts one for this page alone; neither = parsed inline
+        self.parse_pool = parse_pool or (ParsePool(parse_workers) if parse_workers else None)
+        self.owns_parse_pool = parse_pool is None and self.parse_pool is not None
+        # har_mode='record' archives the session's network traffic to
+        # har_path; 'replay' serves the same scrape entirely from it
+        if har_mode not in (None,) + HAR_MODES:
+            raise ValueError(f"har_mode must be one of {HAR_MODES}, got {har_mode!r}")
+        self.har_mode = har_mode
+        self.har_path = Path(har_path) if har_path else HAR_DIR / f"{output_name or 'session'}.har"
+        # incremental=True keeps only items missing from the seen index,
+        # stops scrolling at a run of known items, and merges the new items
+        # into the stored latest snapshot
+        self.incremental = incremental
+        self.seen_index = None
+        self.known_keys = {kind: [] for kind in KINDS}  # re-seen this run, last_seen bumped in the store
+        # None = DEFAULT_RESOURCE_POLICY, False = load everything
+        self.resource_policy = resource_policy
+        self.resource_filter = None
+        # Batch runs write scraped_data_<output_name>_*.json per page
+        self.output_name = output_name
+        # parallel=True extracts the main, /reviews and /photos views in
+        # separate tabs, at most `concurrency` of them loading at once
+        self.parallel = parallel
+        self.concurrency = max(1, concurrency)
         self.results = {
             'business_name': 'U Debrock Finishes',
             'scraped_at': datetime.now().isoformat(),
@@ -26,125 +505,590 @@ class UdebrockScraper:
             'reviews': [],
             'images': [],
             'posts': [],
-            'metadata': {}
+            'metadata': PageMetadata()
         }
+        self.scroll_limits = {phase: dict(limits) for phase, limits in DEFAULT_SCROLL_LIMITS.items()}
+        # Which fallback selectors matched on this page last time - tried first
+        self.selector_cache = SelectorCache()
+        self.selector_page = page_slug(self.page_url)
+        # Seconds earlier phases finished under budget, available to later ones
+        self.spare_s = 0.0
+        for phase, limits in (scroll_limits or {}).items():
+            self.scroll_limits.setdefault(phase, {}).update(limits)
+        # Wall time, Playwright round-trips, items found/kept, timeouts and
+        # bytes written per phase - saved as metrics_*.json with the results
+        self.metrics = RunMetrics()
+        self.metrics.info['page_url'] = self.page_url
+        self.metrics.info['scraped_at'] = self.results['scraped_at']
     
-    async def scrape(self):
-        """Main scraping orchestrator - NO LOGIN REQUIRED"""
-        async with async_playwright() as p:
-            # Launch browser without session file (public scraping)
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',
-                    '--no-sandbox'
-                ]
-            )
+    async def _evaluate(self, page, phase, script, arg=None):
+        """Run an in-page harvester, timing and counting the round-trip against a phase"""
+        self.metrics.count(phase, IPC_CALLS)
+        with self.metrics.phase(phase):
+            return await page.evaluate(script, arg)
+    
+    def _count_legacy(self, phase, calls):
+        # Estimated round-trips the old per-element extraction would have
+        # needed for the same elements - modelled, not measured; probe loops
+        # that stopped at their first hit are counted up to the hit
+        self.metrics.count(phase, IPC_CALLS_PER_ELEMENT, calls)
+    
+    def _star_probes(self):
+        return self.selector_cache.rank(self.selector_page, 'stars', STAR_PROBES)
+    
+    def _record_star_probes(self, cards):
+        wins = {}
+        for card in cards:
+            probe = card['stars'].pop('probe', None) if card.get('stars') else None
+            # The old extraction tried STAR_PROBES in order until one matched
+            card['legacy_star_probes'] = STAR_PROBES.index(probe) + 1 if probe in STAR_PROBES else len(STAR_PROBES)
+            if probe:
+                wins[probe] = wins.get(probe, 0) + 1
+        for probe, count in wins.items():
+            self.selector_cache.record(self.selector_page, 'stars', probe, count)
+    
+    def _phase_budget(self, base_s):
+        """A phase's own budget plus whatever earlier phases left unused"""
+        return base_s + self.spare_s
+    
+    def _return_budget(self, budget_s, used_s):
+        # Concurrent tabs would each spend the same spare time - only
+        # serial runs carry it over
+        if not self.parallel:
+            self.spare_s = min(MAX_SPARE_S, max(0.0, budget_s - used_s))
+    
+    async def _goto(self, page, url, ready_selector=MAIN_READY_SELECTOR, budget_s=NAV_BUDGET_S):
+        """Navigate and wait for DOM content plus the first ready_selector match
+        
+        Both waits share one deadline; a missing ready element is counted as
+        a timeout and extraction goes ahead with whatever rendered.
+        """
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+        
+        loop = asyncio.get_running_loop()
+        budget = self._phase_budget(budget_s)
+        started = loop.time()
+        with self.metrics.phase('navigation'):
+            self.metrics.count('navigation', IPC_CALLS)
+            try:
+                await page.goto(url, wait_until='domcontentloaded', timeout=budget * 1000)
+            except PlaywrightTimeoutError:
+                self.metrics.count('navigation', TIMEOUTS)
+                self._return_budget(budget, budget)
+                raise
+            if ready_selector:
+                remaining_ms = (budget - (loop.time() - started)) * 1000
+                self.metrics.count('navigation', IPC_CALLS)
+                try:
+                    await page.wait_for_selector(ready_selector, state='attached', timeout=max(100, remaining_ms))
+                except PlaywrightTimeoutError:
+                    self.metrics.count('navigation', TIMEOUTS)
+        self._return_budget(budget, loop.time() - started)
+    
+    def _output_prefix(self):
+        return f'scraped_data_{self.output_name}' if self.output_name else 'scraped_data'
+    
+    def _load_seen_index(self):
+        """Open the page's seen index, seeding it from the latest snapshot on first use"""
+        suffix = f'_{self.output_name}' if self.output_name else ''
+        self.seen_index = SeenIndex(OUTPUT_DIR / f'seen_index{suffix}.json')
+        latest_file = OUTPUT_DIR / f'{self._output_prefix()}_latest.json'
+        if not len(self.seen_index) and latest_file.exists():
+            with open(latest_file, encoding='utf-8') as f:
+                self.seen_index.seed(json.load(f))
+        print(f"[INFO] Incremental mode: {len(self.seen_index)} items already known")
+    
+    def _accept(self, kind, key, seen_keys):
+        """True for an item not yet collected this run and not already stored"""
+        if key is None or key in seen_keys:
+            return False
+        seen_keys.add(key)
+        if self.incremental and self.seen_index.has(kind, key):
+            self.known_keys[kind].append(key)
+            return False
+        return True
+    
+    def _card_key(self, kind, value, stars=None):
+        """Key a scrolled item the way it will be stored (see record_key)"""
+        if kind == 'images':
+            return image_key(value)
+        if kind == 'reviews':
+            if not is_review_card(value):
+                return None
+            return card_key(parse_review(value, stars), value)
+        return item_key(value)
+    
+    async def _parse_review_cards(self, cards, min_cards: int = MIN_POOL_CARDS) -> list:
+        """parse_cards() results for collected review cards, cached on each
+        card as 'parsed' so the scroll's known-run check and the extraction
+        parse every card once; runs on the parse pool when one is set"""
+        pending = [card for card in cards if 'parsed' not in card]
+        if pending:
+            if self.parse_pool:
+                parsed = await self.parse_pool.parse(pending, min_cards)
+            else:
+                parsed = parse_cards([(card['text'], card.get('stars')) for card in pending])
+            for card, result in zip(pending, parsed):
+                card['parsed'] = result
+        return [card['parsed'] for card in cards]
+    
+    async def _scroll_feed(self, page, phase, item_selector='[role="article"]', key_kind=None, collect=False):
+        """Scroll until the phase's item target, time budget or stall limit is hit
+        
+        With key_kind set in incremental mode, newly mounted items are keyed
+        after every step and scrolling stops at a run of already-known ones.
+        With collect, cards are harvested as they mount and returned under
+        'cards' (HARVEST_CARDS_JS shape plus a stable 'id'), in mount order.
+        """
+        limits = self.scroll_limits.get(phase, {})
+        max_scrolls = limits.get('max_scrolls') or 10
+        item_target = limits.get('item_target')
+        time_budget = limits.get('time_budget')
+        if time_budget:
+            time_budget = self._phase_budget(time_budget)
+        stall_limit = limits.get('stall_limit', SCROLL_STALL_LIMIT)
+        step_timeout = limits.get('step_timeout_ms', SCROLL_STEP_TIMEOUT_MS)
+        known_run = limits.get('known_run') if self.incremental and key_kind else None
+        
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        scroll_phase = f'{phase}_scroll'
+        self.metrics.count(scroll_phase, IPC_CALLS)
+        if collect:
+            count, height = await page.evaluate(
+                START_COLLECTOR_JS, [item_selector, self._star_probes(), self.prune_dom])
+        else:
+            count, height = await page.evaluate(
+                '(s) => [document.querySelectorAll(s).length, document.body.scrollHeight]', item_selector)
+        cards = []
+        step_ms = []
+        scroll_attempts = 0
+        stalls = 0
+        stalled_ms = 0
+        stop_reason = 'max_scrolls'
+        scanned = 0
+        known_streak = 0
+        
+        while scroll_attempts < max_scrolls:
+            # Mounted items plateau under virtualization (always with
+            # prune_dom), so a collecting scroll counts the cards it harvested
+            if item_target and (len(cards) if collect else count) >= item_target:
+                stop_reason = 'item_target'
+                break
+            elapsed = loop.time() - started
+            if time_budget and elapsed >= time_budget:
+                stop_reason = 'time_budget'
+                break
             
-            context = await browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                locale='en-US',
-                timezone_id='America/New_York'
-            )
+            timeout = step_timeout
+            if time_budget:
+                timeout = max(100, min(timeout, int((time_budget - elapsed) * 1000)))
+            self.metrics.count(scroll_phase, IPC_CALLS)
+            step_started = loop.time()
+            step = await page.evaluate(SCROLL_STEP_JS, [item_selector, count, height, timeout, SCROLL_XHR_GRACE_MS])
+            step_ms.append(round((loop.time() - step_started) * 1000))
+            scroll_attempts += 1
+            if step['reason'] == 'timeout':
+                self.metrics.count(scroll_phase, TIMEOUTS)
             
-            page = await context.new_page()
+            cards.extend(step['cards'])
+            # Under virtualization the mounted count can hold steady while
+            # new cards replace old ones, so collected cards count as progress
+            if step['count'] > count or step['height'] > height or step['cards']:
+                stalls = stalled_ms = 0
+            else:
+                # Includes a feed request that rendered nothing within the grace
+                stalls += 1
+                stalled_ms += step_ms[-1]
+            count = max(count, step['count'])
+            height = max(height, step['height'])
+            print(f"  [INFO] Scroll {scroll_attempts}/{max_scrolls} ({step['reason']}, "
+                  f"{len(cards) if collect else count} items)")
             
-            try:
-                print("=" * 60)
-                print("FACEBOOK BUSINESS PAGE SCRAPER")
-                print("=" * 60)
-                print(f"[TARGET] {self.page_url}")
+            if stalls >= stall_limit and stalled_ms >= step_timeout:
+                stop_reason = 'stalled'
+                break
+            
+            if known_run and collect and key_kind == 'reviews':
+                # Any step's worth goes to the pool - the event loop is driving the scroll
+                parsed = await self._parse_review_cards(step['cards'], min_cards=1)
+                keys = [result and result[0] for result in parsed]
+            elif known_run and collect:
+                keys = [self._card_key(key_kind, card['text'], card.get('stars')) for card in step['cards']]
+            elif known_run and step['count'] > scanned:
+                attr = 'src' if key_kind == 'images' else None
+                self.metrics.count(scroll_phase, IPC_CALLS)
+                values = await page.evaluate(HARVEST_KEYS_JS, [item_selector, scanned, attr])
+                scanned = step['count']
+                keys = [self._card_key(key_kind, value) for value in values]
+            else:
+                keys = []
+            if keys:
+                for key in keys:
+                    if key is None:
+                        continue
+                    known_streak = known_streak + 1 if self.seen_index.has(key_kind, key) else 0
+                if known_streak >= known_run:
+                    stop_reason = 'known_items'
+                    break
+        
+        if collect:
+            self.metrics.count(scroll_phase, IPC_CALLS)
+            collector = await page.evaluate(STOP_COLLECTOR_JS)
+            cards.extend(collector['cards'])
+            self.metrics.info.setdefault('cards_collected', {})[phase] = len(cards)
+            if self.prune_dom:
+                self.metrics.info.setdefault('cards_pruned', {})[phase] = collector['pruned']
+        
+        elapsed = loop.time() - started
+        if time_budget:
+            self._return_budget(time_budget, elapsed)
+        self.metrics.add_time(scroll_phase, elapsed)
+        self.metrics.count(scroll_phase, ITEMS_FOUND, len(cards) if collect else count)
+        self.metrics.info.setdefault('scroll_stop_reasons', {})[phase] = stop_reason
+        # Per-step latency - flat with prune_dom, growing with the feed without
+        self.metrics.info.setdefault('scroll_step_ms', {})[phase] = step_ms
+        print(f"[OK] Completed {scroll_attempts} scrolls in {elapsed:.1f}s (stopped: {stop_reason}"
+              + (f", {len(cards)} cards collected)" if collect else ")"))
+        return {
+            'scrolls': scroll_attempts,
+            'items': len(cards) if collect else count,
+            'cards': cards,
+            'elapsed': round(elapsed, 2),
+            'stop_reason': stop_reason
+        }
+    
+    async def scrape(self, browser=None):
+        """Main scraping orchestrator - NO LOGIN REQUIRED
+        
+        Pass a shared browser to scrape in a fresh context of it (batch mode);
+        otherwise a browser is launched for this page alone.
+        """
+        if browser is None:
+            from playwright.async_api import async_playwright
+            
+            async with async_playwright() as p:
+                browser = await launch_browser(p)
+                try:
+                    return await self.scrape(browser)
+                finally:
+                    await browser.close()
+        
+        context = await new_context(browser)
+        if self.capture_images:
+            from image_capture import CDN_IMAGE_PATTERN, ImageCapture
+            self.image_capture = ImageCapture()
+            self.image_capture.attach(context)
+        if self.resource_policy is not False:
+            policy = DEFAULT_RESOURCE_POLICY if self.resource_policy is None else self.resource_policy
+            if self.capture_images:
+                # Stubbed images have no bytes to capture - let CDN images through
+                policy = dict(policy, pass_patterns=policy.get('pass_patterns', []) + [CDN_IMAGE_PATTERN])
+            self.resource_filter = ResourceFilter(policy)
+            await self.resource_filter.install(context)
+        if self.har_mode:
+            await self._install_har(context)
+        
+        try:
+            print("=" * 60)
+            print("FACEBOOK BUSINESS PAGE SCRAPER")
+            print("=" * 60)
+            print(f"[TARGET] {self.page_url}")
+            print("")
+            
+            if self.incremental:
+                self._load_seen_index()
+            
+            if self.stream:
+                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                self.record_stream = RecordStream(OUTPUT_DIR / f'{self._output_prefix()}_{timestamp}.ndjson')
+                print(f"[INFO] Streaming records to {self.record_stream.path}")
                 print("")
+            
+            if self.parallel:
+                # Main, reviews and photos views as concurrent tabs
+                await self._extract_parallel(context)
+            else:
+                page = await context.new_page()
                 
                 # Extract from main page with infinite scroll
                 await self._extract_main_page(page)
+                self._checkpoint()
                 
                 # Extract all content with infinite scroll on main page
                 await self._extract_all_content(page)
+                self._checkpoint()
                 
                 # Extract reviews
                 await self._extract_reviews(page)
+                self._checkpoint()
                 
-                # Save results
-                self._save_results()
-                
-            except Exception as e:
-                print(f"[ERROR] Scraping failed: {e}")
-                raise
-            finally:
-                await browser.close()
+                # Extract images from the photos tab
+                await self._extract_images(page)
+                self._checkpoint()
+            
+            # Main feed and photos tab overlap
+            self._dedupe_images()
+            
+            if self.near_dedupe:
+                self._collapse_near_duplicates()
+            
+            if self.image_capture:
+                await self._attach_captured_images()
+            
+            if self.download_images:
+                await self._process_images()
+            
+            if self.perceptual_dedupe:
+                await self._collapse_similar_images()
+            
+            if self.store:
+                # Before the incremental merge - only this run's items count as seen
+                self._record_run()
+            
+            if self.incremental:
+                self._update_seen_index()
+                self._merge_previous()
+            
+            if self.record_stream:
+                # Dedupe, capture, the image pipeline and merges rewrote these
+                # lists after they were streamed
+                for kind in (KINDS if self.incremental or self.near_dedupe else ('images',)):
+                    self.record_stream.replace(kind, self.results[kind])
+                self._checkpoint()
+            
+            # Save results
+            output_file = self._save_results()
+            self.selector_cache.save()
+            if self.incremental:
+                self.seen_index.save()
+            return output_file
+            
+        except Exception as e:
+            print(f"[ERROR] Scraping failed: {e}")
+            raise
+        finally:
+            if self.scrape_store:
+                self.scrape_store.close()
+            if self.record_stream:
+                self.record_stream.close()
+            if self.owns_parse_pool:
+                self.parse_pool.close()
+            await context.close()
+    
+    def _emit(self, kind, record):
+        """Collect one record, streaming it out straight away when enabled"""
+        self.results[kind].append(record)
+        if self.record_stream:
+            self.record_stream.append(kind, record)
+    
+    def _checkpoint(self):
+        """End of a phase - stream the page fields and metadata, then flush"""
+        if self.record_stream:
+            self.record_stream.append('run', {
+                field: self.results[field] for field in ('business_name', 'scraped_at', 'page_url')
+            })
+            self.record_stream.append('metadata', self.results['metadata'])
+            self.record_stream.flush()
+    
+    async def _install_har(self, context):
+        """Record the session into, or replay it from, a HAR archive"""
+        if self.har_mode == 'record':
+            # Written when the context closes, after filtering - stubbed and
+            # blocked requests are archived as such
+            self.har_path.parent.mkdir(parents=True, exist_ok=True)
+            await context.route_from_har(self.har_path, update=True, update_content='embed')
+            print(f"[INFO] Recording network traffic to {self.har_path}")
+        else:
+            if not self.har_path.exists():
+                raise FileNotFoundError(f"No HAR archive to replay at {self.har_path} - record one first")
+            # Anything not in the archive is aborted, so a replay never
+            # touches the network
+            await context.route_from_har(self.har_path, not_found='abort')
+            print(f"[INFO] Replaying network traffic from {self.har_path}")
+    
+    async def _extract_parallel(self, context):
+        """Extract the main, reviews and photos views in concurrent tabs of one context"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async def run_tab(name, *steps):
+            async with semaphore:
+                print(f"[INFO] Opening {name} tab...")
+                page = await context.new_page()
+                try:
+                    for step in steps:
+                        await step(page)
+                        self._checkpoint()
+                finally:
+                    await page.close()
+        
+        # Every tab appends into self.results; the event loop runs one
+        # coroutine at a time, so the merge needs no locking
+        await asyncio.gather(
+            run_tab('main', self._extract_main_page, self._extract_all_content),
+            run_tab('reviews', self._extract_reviews),
+            run_tab('photos', self._extract_images),
+        )
+    
+    def _dedupe_images(self):
+        """Drop images collected by more than one phase and renumber"""
+        seen = set()
+        images = []
+        for image in self.results['images']:
+            key = record_key('images', image)
+            if key in seen:
+                continue
+            seen.add(key)
+            image['index'] = len(images) + 1
+            images.append(image)
+        self.results['images'] = images
+    
+    async def _attach_captured_images(self):
+        """Point image entries at the bodies captured during the scroll"""
+        with self.metrics.phase('image_capture'):
+            await self.image_capture.drain()
+        attached = 0
+        for image in self.results['images']:
+            path = self.image_capture.local_path(image['url'])
+            if path:
+                image['local_path'] = path.relative_to(OUTPUT_DIR).as_posix()
+                attached += 1
+        self.metrics.count('image_capture', ITEMS_FOUND, self.image_capture.stats['captured'])
+        self.metrics.count('image_capture', ITEMS_KEPT, attached)
+        self.metrics.info['image_capture'] = self.image_capture.stats
+        print(f"[OK] Captured image bodies: {attached}/{len(self.results['images'])} images stored locally")
+    
+    async def _process_images(self):
+        """Download and re-encode collected images off the event loop"""
+        # Pillow/requests are only needed when the pipeline is enabled
+        from image_pipeline import ImagePipeline
+        
+        print("")
+        pipeline = ImagePipeline()
+        with self.metrics.phase('image_pipeline'):
+            await asyncio.to_thread(pipeline.process, self.results['images'])
+        self.metrics.count('image_pipeline', ITEMS_FOUND, len(self.results['images']))
+        self.metrics.count('image_pipeline', ITEMS_KEPT,
+                           pipeline.stats['fetched'] + pipeline.stats['local'] + pipeline.stats['cached'])
+        self.metrics.info['images'] = pipeline.stats
+    
+    async def _collapse_similar_images(self):
+        """Merge near-identical images into one canonical entry each"""
+        # Pillow is only needed when perceptual dedupe is enabled
+        from image_dedupe import collapse_duplicates
+        
+        found = len(self.results['images'])
+        with self.metrics.phase('image_dedupe'):
+            self.results['images'] = await asyncio.to_thread(
+                collapse_duplicates, self.results['images'], OUTPUT_DIR
+            )
+        kept = len(self.results['images'])
+        self.metrics.count('image_dedupe', ITEMS_FOUND, found)
+        self.metrics.count('image_dedupe', ITEMS_KEPT, kept)
+        print(f"[OK] Perceptual dedupe: {found} images -> {kept} distinct")
+    
+    def _collapse_near_duplicates(self):
+        """Merge near-identical reviews and posts into one entry each"""
+        from text_dedupe import NearDuplicateIndex, collapse_duplicates
+        
+        suffix = f'_{self.output_name}' if self.output_name else ''
+        found = {kind: len(self.results[kind]) for kind in ('reviews', 'posts')}
+        with self.metrics.phase('text_dedupe'):
+            folded = collapse_duplicates(self.results, NearDuplicateIndex(OUTPUT_DIR / f'text_index{suffix}.json'))
+        self.metrics.count('text_dedupe', ITEMS_FOUND, sum(found.values()))
+        self.metrics.count('text_dedupe', ITEMS_KEPT, sum(found.values()) - sum(folded.values()))
+        if any(folded.values()):
+            print(f"[OK] Near-duplicate dedupe: folded {folded['reviews']} reviews, {folded['posts']} posts")
+    
+    def _record_run(self):
+        """Upsert this run's items, metadata and run row into the SQLite store"""
+        from store import ScrapeStore
+        
+        with self.metrics.phase('store'):
+            self.scrape_store = ScrapeStore()
+            self.run_id = self.scrape_store.record_run(self.results, known=self.known_keys)
+        self.metrics.count('store', ITEMS_KEPT, sum(len(self.results[kind]) for kind in KINDS))
+        self.metrics.info['run_id'] = self.run_id
+    
+    def _update_seen_index(self):
+        for kind in KINDS:
+            for record in self.results[kind]:
+                self.seen_index.add(kind, record_key(kind, record), self.results['scraped_at'])
+    
+    def _merge_previous(self):
+        """Put this run's new items in front of the stored latest snapshot"""
+        latest_file = OUTPUT_DIR / f'{self._output_prefix()}_latest.json'
+        new_counts = {kind: len(self.results[kind]) for kind in KINDS}
+        if latest_file.exists():
+            with open(latest_file, encoding='utf-8') as f:
+                previous = json.load(f)
+            for kind in KINDS:
+                current = {record_key(kind, record): record for record in self.results[kind]}
+                for record in previous.get(kind, []):
+                    match = current.get(record_key(kind, record))
+                    if match is None:
+                        self.results[kind].append(record)
+                    elif len(record.get('full_text') or '') > len(match.get('full_text') or ''):
+                        # Same item, stored expanded - keep the longest text
+                        match['full_text'] = record['full_text']
+                for index, record in enumerate(self.results[kind], 1):
+                    record['index'] = index
+            self.results['metadata'] = {**previous.get('metadata', {}), **self.results['metadata']}
+        print("")
+        print("[INFO] Incremental merge:")
+        for kind in KINDS:
+            print(f"  - {kind}: {new_counts[kind]} new, {len(self.known_keys[kind])} already stored")
     
     async def _extract_main_page(self, page):
         """Extract basic info from main page"""
         print("[INFO] Loading main page...")
-        await page.goto(self.page_url, wait_until='networkidle', timeout=30000)
-        await page.wait_for_timeout(3000)
+        await self._goto(page, self.page_url)
         
         print("[INFO] Extracting metadata...")
         
-        # Business name
+        about_selectors = self.selector_cache.rank(self.selector_page, 'about', ABOUT_SELECTORS)
         try:
-            name = await page.locator('h1').first.inner_text()
-            self.results['metadata']['name'] = name
-            self.results['business_name'] = name
-            print(f"  [OK] Business: {name}")
-        except:
+            meta = await self._evaluate(page, 'metadata', HARVEST_METADATA_JS, about_selectors)
+        except Exception as e:
+            print(f"  [WARN] Could not harvest metadata: {e}")
+            meta = {}
+        about_selector = meta.pop('about_selector', None)
+        if about_selector:
+            self.selector_cache.record(self.selector_page, 'about', about_selector)
+        # h1, the about probes up to the first hit (in their original order),
+        # rating span list, phone, email locator + href
+        about_probes = ABOUT_SELECTORS.index(about_selector) + 1 if about_selector else len(ABOUT_SELECTORS)
+        self._count_legacy('metadata', 5 + about_probes)
+        
+        # Business name
+        if meta.get('name'):
+            self.results['metadata']['name'] = meta['name']
+            self.results['business_name'] = meta['name']
+            print(f"  [OK] Business: {meta['name']}")
+        else:
             print("  [WARN] Could not extract business name")
         
         # About/Description
-        try:
-            about_selectors = [
-                'div[data-ad-comet-preview="message"]',
-                'div[data-testid="about_text"]',
-                'div.x1y1aw1k.xn6708d.xwib8y2.x1ye3gou'
-            ]
-            
-            for selector in about_selectors:
-                try:
-                    about = await page.locator(selector).first.inner_text(timeout=2000)
-                    if about:
-                        self.results['metadata']['about'] = about
-                        print(f"  [OK] About: {about[:80]}...")
-                        break
-                except:
-                    continue
-        except:
-            pass
+        if meta.get('about'):
+            self.results['metadata']['about'] = meta['about']
+            print(f"  [OK] About: {meta['about'][:80]}...")
         
         # Rating/Reviews count
-        try:
-            rating_elements = await page.locator('span:has-text("★")').all()
-            for elem in rating_elements:
-                text = await elem.inner_text()
-                if '★' in text or 'star' in text.lower():
-                    self.results['metadata']['rating'] = text
-                    print(f"  [OK] Rating: {text}")
-                    break
-        except:
-            pass
+        if meta.get('rating'):
+            self.results['metadata']['rating'] = meta['rating']
+            print(f"  [OK] Rating: {meta['rating']}")
         
         # Contact info
-        try:
-            # Phone
-            phone_elem = await page.locator('a[href^="tel:"]').first.inner_text(timeout=2000)
-            if phone_elem:
-                self.results['metadata']['phone'] = phone_elem
-                print(f"  [OK] Phone: {phone_elem}")
-        except:
-            pass
+        if meta.get('phone'):
+            self.results['metadata']['phone'] = meta['phone']
+            print(f"  [OK] Phone: {meta['phone']}")
         
-        try:
-            # Email
-            email_elem = await page.locator('a[href^="mailto:"]').first
-            email = await email_elem.get_attribute('href', timeout=2000)
-            if email:
-                self.results['metadata']['email'] = email.replace('mailto:', '')
-                print(f"  [OK] Email: {self.results['metadata']['email']}")
-        except:
-            pass
+        if meta.get('email'):
+            self.results['metadata']['email'] = meta['email'].replace('mailto:', '')
+            print(f"  [OK] Email: {self.results['metadata']['email']}")
         
+        self.metrics.count('metadata', ITEMS_FOUND, sum(1 for value in meta.values() if value))
+        self.metrics.count('metadata', ITEMS_KEPT, len(self.results['metadata']))
         print(f"[OK] Metadata extracted: {len(self.results['metadata'])} fields")
     
     async def _extract_all_content(self, page):
@@ -152,79 +1096,64 @@ class UdebrockScraper:
         print("")
         print("[INFO] Scrolling main page to load all content...")
         
-        # Perform infinite scroll on main page
-        last_height = await page.evaluate('document.body.scrollHeight')
-        scroll_attempts = 0
-        max_scrolls = 15
-        
-        while scroll_attempts < max_scrolls:
-            await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-            await page.wait_for_timeout(2000)
-            
-            new_height = await page.evaluate('document.body.scrollHeight')
-            
-            if new_height == last_height:
-                await page.wait_for_timeout(1000)
-                new_height = await page.evaluate('document.body.scrollHeight')
-                if new_height == last_height:
-                    break
-            
-            last_height = new_height
-            scroll_attempts += 1
-            print(f"  [INFO] Scroll {scroll_attempts}/{max_scrolls}")
-        
-        print(f"[OK] Completed {scroll_attempts} scrolls")
+        # Perform infinite scroll on main page, collecting posts as they mount
+        scroll = await self._scroll_feed(page, 'posts', key_kind='posts', collect=True)
         
         # Extract posts
         print("[INFO] Extracting posts...")
-        posts = await page.locator('[role="article"]').all()
-        print(f"  [INFO] Found {len(posts)} post elements")
+        collected = scroll['cards']
+        self._count_legacy('posts', 1 + min(len(collected), POST_CARD_LIMIT))
+        print(f"  [INFO] Found {len(collected)} post elements")
         
-        for i, post in enumerate(posts[:30]):
-            try:
-                text = await post.inner_text()
-                if text and len(text) > 30:
-                    self.results['posts'].append({
-                        'index': len(self.results['posts']) + 1,
-                        'text': text[:500],
-                        'full_text': text
-                    })
-                    if len(self.results['posts']) % 5 == 0:
-                        print(f"  [INFO] Collected {len(self.results['posts'])} posts...")
-            except:
-                continue
+        seen_keys = set()
+        for card in collected[:POST_CARD_LIMIT]:
+            text = card['text']
+            if text and len(text) > 30:
+                key = item_key(text)
+                if not self._accept('posts', key, seen_keys):
+                    continue
+                self._emit('posts', Post(len(self.results['posts']) + 1, key, text))
+                if len(self.results['posts']) % 5 == 0:
+                    print(f"  [INFO] Collected {len(self.results['posts'])} posts...")
         
+        self.metrics.count('posts', ITEMS_FOUND, len(collected))
+        self.metrics.count('posts', ITEMS_KEPT, len(self.results['posts']))
         print(f"[OK] Total posts: {len(self.results['posts'])}")
         
-        # Extract images
+        # Extract images - those of the feed cards as collected while they
+        # were mounted, then whatever is still in the DOM (cover, header)
         print("[INFO] Extracting images...")
-        images = await page.locator('img[src*="scontent"], img[src*="fbcdn"]').all()
+        dom_images = await self._evaluate(page, 'images', HARVEST_IMAGES_JS, 'img[src*="scontent"], img[src*="fbcdn"]')
+        images = [img for card in collected for img in card['images']] + dom_images
+        self._count_legacy('images', 1 + 2 * len(dom_images))
         print(f"  [INFO] Found {len(images)} image elements")
         
+        kept_before = len(self.results['images'])
         seen = set()
-        for i, img in enumerate(images):
-            try:
-                src = await img.get_attribute('src')
-                alt = await img.get_attribute('alt') or ''
+        for img in images:
+            src = img['src']
+            alt = img['alt']
+            
+            if src and ('scontent' in src or 'fbcdn' in src):
+                # Skip tiny images (profile pics, icons, etc)
+                if 'p50x50' in src or 'p32x32' in src or 's50x50' in src:
+                    continue
                 
-                if src and ('scontent' in src or 'fbcdn' in src) and src not in seen:
-                    # Skip tiny images (profile pics, icons, etc)
-                    if 'p50x50' in src or 'p32x32' in src or 's50x50' in src:
-                        continue
-                    
-                    seen.add(src)
-                    self.results['images'].append({
-                        'index': len(self.results['images']) + 1,
-                        'url': src,
-                        'alt': alt,
-                        'source': 'facebook'
-                    })
-                    
-                    if len(self.results['images']) % 10 == 0:
-                        print(f"  [INFO] Collected {len(self.results['images'])} images...")
-            except:
-                continue
+                key = image_key(src)
+                if not self._accept('images', key, seen):
+                    continue
+                self._emit('images', Image(len(self.results['images']) + 1, key, src, alt))
+                
+                if len(self.results['images']) % 10 == 0:
+                    print(f"  [INFO] Collected {len(self.results['images'])} images...")
         
+        self.metrics.count('images', ITEMS_FOUND, len(images))
+        self.metrics.count('images', ITEMS_KEPT, len(self.results['images']) - kept_before)
+        # Images no longer in the DOM at harvest time - unmounted by the feed
+        # or swapped for placeholders by prune_dom
+        dom_keys = {image_key(img['src']) for img in dom_images}
+        self.metrics.info['images_from_unmounted_cards'] = sum(
+            1 for image in self.results['images'][kept_before:] if image['key'] not in dom_keys)
         print(f"[OK] Total images: {len(self.results['images'])}")
     
     async def _extract_reviews(self, page):
@@ -239,88 +1168,58 @@ class UdebrockScraper:
         try:
             # Go directly to reviews URL
             print(f"[INFO] Navigating directly to reviews page: {reviews_url}")
-            await page.goto(reviews_url, wait_until='networkidle', timeout=30000)
-            await page.wait_for_timeout(3000)
+            await self._goto(page, reviews_url, REVIEWS_READY_SELECTOR)
             
             # Verify we're on the reviews page
             current_url = page.url
             print(f"  [INFO] Current URL: {current_url}")
             if '/reviews' not in current_url:
                 print("  [WARN] Not on reviews page, waiting for redirect...")
-                await page.wait_for_timeout(2000)
+                with self.metrics.phase('navigation'):
+                    self.metrics.count('navigation', IPC_CALLS)
+                    try:
+                        await page.wait_for_url(lambda url: '/reviews' in url, timeout=REDIRECT_WAIT_MS)
+                    except Exception:
+                        self.metrics.count('navigation', TIMEOUTS)
                 current_url = page.url
                 print(f"  [INFO] Updated URL: {current_url}")
             
             print("[INFO] Scrolling to load more reviews...")
             
             # Infinite scroll for reviews
-            last_height = await page.evaluate('document.body.scrollHeight')
-            scroll_attempts = 0
-            max_scrolls = 10
-            
-            while scroll_attempts < max_scrolls:
-                await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-                await page.wait_for_timeout(2000)
-                
-                new_height = await page.evaluate('document.body.scrollHeight')
-                
-                if new_height == last_height:
-                    await page.wait_for_timeout(1000)
-                    new_height = await page.evaluate('document.body.scrollHeight')
-                    if new_height == last_height:
-                        break
-                
-                last_height = new_height
-                scroll_attempts += 1
-                print(f"  [INFO] Scroll {scroll_attempts}/{max_scrolls}")
+            scroll = await self._scroll_feed(page, 'reviews', key_kind='reviews', collect=True)
             
             # Look for individual review cards - each review is in its own article element
             print("[INFO] Looking for individual review elements...")
             
-            # Find all article elements first
-            all_articles = await page.locator('[role="article"]').all()
+            # Every article (text + star markup) the scroll collected as it mounted
+            star_probes = self._star_probes()
+            all_articles = scroll['cards']
+            self._count_legacy('reviews', 1 + len(all_articles))
             print(f"  [INFO] Found {len(all_articles)} article elements total")
             
             reviews_found = []
-            seen_texts = set()  # Track unique reviews to avoid duplicates
+            seen_keys = set()  # Track unique reviews to avoid duplicates
             
-            for elem in all_articles:
-                try:
-                    text = await elem.inner_text(timeout=1000)
-                    if not text or len(text) < 50:
-                        continue
-                    
-                    # Must contain "recommends Elite Painting" pattern to be a review
-                    if 'recommends' not in text.lower() or 'elite painting' not in text.lower():
-                        continue
-                    
-                    # Skip if it's the header/overview (contains "100% recommend" or follower count)
-                    if '100% recommend' in text or 'followers' in text or 'following' in text:
-                        continue
-                    
-                    # Skip if it's just the business response (starts with "Elite Painting" and is short)
-                    lines = text.split('\n')
-                    if len(lines) > 0 and lines[0].strip() == 'Elite Painting' and len(text) < 200:
-                        continue
-                    
-                    # Extract a unique identifier from the review (first 100 chars of review text)
-                    # Find the actual review text (after "recommends Elite Painting")
-                    review_match = re.search(r'recommends[^\\n]*Elite Painting[^\\n]*\\n\\n(.{50,})', text, re.DOTALL | re.IGNORECASE)
-                    if review_match:
-                        review_snippet = review_match.group(1)[:100].strip()
-                    else:
-                        # Fallback: use first meaningful line
-                        review_snippet = text[:100].strip()
-                    
-                    # Skip if we've seen this review before
-                    if review_snippet in seen_texts:
-                        continue
-                    
-                    seen_texts.add(review_snippet)
-                    reviews_found.append(elem)
-                    
-                except Exception as e:
+            # Filter, key and parse every card off the event loop when a
+            # parse pool is set (cards the incremental scroll already
+            # parsed are not parsed again); cards are keyed on their words so
+            # truncated/expanded copies and relative timestamps don't defeat
+            # the dedupe
+            with self.metrics.phase('review_parsing'):
+                await self._parse_review_cards(all_articles)
+            
+            for card in all_articles:
+                result = card.pop('parsed')
+                if result is None:
                     continue
+                key, record = result
+                if not self._accept('reviews', key, seen_keys):
+                    continue
+                
+                card['key'] = key
+                card['record'] = record
+                reviews_found.append(card)
             
             print(f"  [OK] Found {len(reviews_found)} unique review elements")
             
@@ -328,198 +1227,73 @@ class UdebrockScraper:
                 print("  [WARN] No review elements found with standard selectors")
                 # Try more aggressive selectors
                 print("  [INFO] Trying alternative selectors...")
-                alternative_selectors = [
-                    'div[role="article"]',
-                    'div[data-pagelet]',
-                    'div[class*="review"]',
-                    'div[class*="Review"]',
-                    'span[dir="auto"]',
-                    'div.x1n2onr6'  # Another common Facebook container class
-                ]
+                alternative_selectors = self.selector_cache.rank(
+                    self.selector_page, 'review_container', REVIEW_FALLBACK_SELECTORS)
                 
-                for alt_selector in alternative_selectors:
+                # One compound probe, then a harvest only for selectors that matched
+                try:
+                    counts = await self._evaluate(page, 'reviews', PROBE_SELECTORS_JS, alternative_selectors)
+                except Exception:
+                    counts = {}
+                self._count_legacy('reviews', len(alternative_selectors))
+                
+                for alt_selector in (selector for selector in alternative_selectors if counts.get(selector)):
                     try:
-                        alt_elements = await page.locator(alt_selector).all()
-                        if alt_elements and len(alt_elements) > 0:
-                            print(f"  [INFO] Found {len(alt_elements)} elements with {alt_selector}, checking for reviews...")
+                        alt_harvest = await self._evaluate(page, 'reviews', HARVEST_CARDS_JS, [alt_selector, 10, star_probes])
+                        self._count_legacy('reviews', 1 + len(alt_harvest['cards']))
+                        if alt_harvest['total'] > 0:
+                            print(f"  [INFO] Found {alt_harvest['total']} elements with {alt_selector}, checking for reviews...")
                             # Check if any contain review-like text
-                            for elem in alt_elements[:10]:
-                                try:
-                                    text = await elem.inner_text(timeout=1000)
-                                    if text and ('star' in text.lower() or 'review' in text.lower() or 'rating' in text.lower()):
-                                        reviews_found.append(elem)
-                                        print(f"  [OK] Found potential review element")
-                                except:
-                                    continue
+                            for card in alt_harvest['cards']:
+                                text = card['text']
+                                if text and ('star' in text.lower() or 'review' in text.lower() or 'rating' in text.lower()):
+                                    reviews_found.append(card)
+                                    print(f"  [OK] Found potential review element")
                             if reviews_found:
+                                self.selector_cache.record(self.selector_page, 'review_container', alt_selector)
                                 break
                     except:
                         continue
                 
                 if not reviews_found:
                     # Try to find any text content that might be reviews
-                    all_text = await page.locator('body').inner_text()
+                    all_text = await self._evaluate(page, 'reviews', 'document.body.innerText')
                     if 'review' in all_text.lower() or 'star' in all_text.lower():
                         print("  [INFO] Review content detected but couldn't parse structure")
                         print("  [INFO] Facebook reviews may require authentication or have changed structure")
             
+            self._record_star_probes(reviews_found)
+            
             # Extract review data - look for actual reviews with star ratings
-            for i, elem in enumerate(reviews_found[:30]):  # Check more elements
-                try:
-                    # First check if this element has star ratings (likely a review)
-                    has_stars = False
-                    rating = 5  # Default
-                    
-                    # Look for star indicators in various formats
-                    star_selectors = [
-                        'span[aria-label*="star"]',
-                        'span[aria-label*="Star"]',
-                        'span:has-text("★")',
-                        'span:has-text("⭐")',
-                        'div[aria-label*="star"]',
-                        'div[aria-label*="Star"]'
-                    ]
-                    
-                    for star_selector in star_selectors:
-                        try:
-                            star_elem = await elem.locator(star_selector).first
-                            if await star_elem.count() > 0:
-                                has_stars = True
-                                # Try to get rating from aria-label
-                                aria_label = await star_elem.get_attribute('aria-label', timeout=500)
-                                if aria_label:
-                                    # Extract number from aria-label like "5 out of 5 stars"
-                                    match = re.search(r'(\d+)', aria_label)
-                                    if match:
-                                        rating = int(match.group(1))
-                                else:
-                                    # Count stars in text
-                                    star_text = await star_elem.inner_text(timeout=500)
-                                    if star_text:
-                                        rating = star_text.count('★') + star_text.count('⭐')
-                                        if rating == 0:
-                                            rating = 5
-                                break
-                        except:
-                            continue
-                    
-                    # Get text preview first to check content
-                    text_preview = await elem.inner_text(timeout=1000)
-                    if not text_preview or len(text_preview) < 10:
-                        continue
-                    
-                    # Must contain "recommends" to be a real review, or have clear review indicators
-                    if 'recommends' not in text_preview.lower():
-                        # Check if it's a review by other indicators
-                        if not has_stars and 'star' not in text_preview.lower():
-                            # Skip if it's clearly a post (has date patterns like "January 2 at 1:08 PM")
-                            if any(pattern in text_preview for pattern in ['January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', 'October', 'November', 'December']):
-                                if 'at' in text_preview and ('PM' in text_preview or 'AM' in text_preview):
-                                    continue  # This is a post, not a review
-                    
-                    # Skip obvious non-review content
-                    skip_patterns = ['Send message', 'All reactions:', 'Like', 'Comment', 'Share', 'Elite Painting\nJanuary']
-                    if any(pattern in text_preview for pattern in skip_patterns):
-                        if 'recommends' not in text_preview.lower():
-                            continue
-                    
-                    # Get full text
-                    text = await elem.inner_text(timeout=2000)
-                    
-                    if not text or len(text) < 20:
-                        continue
-                    
-                    # Extract author name - format is "Name recommends Elite Painting."
-                    author = 'Customer'
-                    try:
-                        # Look for pattern like "Stef Candea recommends Elite Painting."
-                        match = re.search(r'^([A-Z][a-z]+(?:\\s+[A-Z][a-z]+)*)\\s+recommends\\s+Elite\\s+Painting', text, re.MULTILINE | re.IGNORECASE)
-                        if match:
-                            author = match.group(1).strip()
-                        else:
-                            # Try to find name in the first line before "recommends"
-                            lines = text.split('\n')
-                            for line in lines[:5]:
-                                line = line.strip()
-                                if 'recommends' in line.lower() and 'elite' in line.lower():
-                                    # Extract name before "recommends"
-                                    parts = re.split(r'\\s+recommends', line, flags=re.IGNORECASE, maxsplit=1)
-                                    if parts and len(parts[0].strip()) < 50:
-                                        author = parts[0].strip()
-                                        break
-                    except:
-                        pass
-                    
-                    # Extract review text - everything after the date, before "All reactions" or business response
-                    review_text = text.strip()
-                    
-                    # Pattern: "Name recommends Elite Painting.\nDate\n·\nReview text here\nAll reactions:"
-                    # Extract text between date and "All reactions:" or business response
-                    match = re.search(
-                        r'recommends[^\\n]*Elite Painting[^\\n]*\\n([^\\n]+\\s+\\d{4})[^\\n]*\\n[^\\n]*\\n(.+?)(?:\\nAll reactions:|\\nElite Painting|$)',
-                        review_text,
-                        re.DOTALL | re.IGNORECASE
-                    )
-                    
-                    if match:
-                        review_text = match.group(2).strip()
-                    else:
-                        # Fallback: try to find text after date pattern
-                        match = re.search(
-                            r'(January|February|March|April|May|June|July|August|September|October|November|December)\\s+\\d{1,2},\\s+\\d{4}[^\\n]*\\n[^\\n]*\\n(.+?)(?:\\nAll reactions:|\\nElite Painting|$)',
-                            review_text,
-                            re.DOTALL | re.IGNORECASE
-                        )
-                        if match:
-                            review_text = match.group(2).strip()
-                        else:
-                            # Last resort: remove everything before first meaningful content
-                            # Remove author and "recommends" line
-                            review_text = re.sub(r'^[^\\n]+recommends[^\\n]+\\n', '', review_text, flags=re.IGNORECASE)
-                            # Remove date line
-                            review_text = re.sub(r'^[^\\n]*\\d{4}[^\\n]*\\n[^\\n]*\\n', '', review_text)
-                    
-                    # Remove "See more" / "See less" links
-                    review_text = re.sub(r'\\s*…\\s*See more', '', review_text, flags=re.IGNORECASE)
-                    review_text = re.sub(r'\\s*See more', '', review_text, flags=re.IGNORECASE)
-                    review_text = re.sub(r'\\s*See less', '', review_text, flags=re.IGNORECASE)
-                    
-                    # Remove "All reactions:" and everything after it
-                    review_text = re.sub(r'\\nAll reactions:.*$', '', review_text, flags=re.DOTALL | re.IGNORECASE)
-                    
-                    # Remove business response (starts with "Elite Painting")
-                    review_text = re.sub(r'\\nElite Painting.*$', '', review_text, flags=re.DOTALL)
-                    
-                    # Remove reaction counts and time stamps (like "35w", "3y", "4y")
-                    review_text = re.sub(r'\\b\\d+[wy]\\b', '', review_text)
-                    
-                    # Clean up extra whitespace and newlines
-                    review_text = ' '.join(review_text.split())
-                    
-                    # Remove any remaining date patterns
-                    review_text = re.sub(r'\\b(January|February|March|April|May|June|July|August|September|October|November|December)\\s+\\d{1,2},\\s+\\d{4}\\b', '', review_text, flags=re.IGNORECASE)
-                    review_text = ' '.join(review_text.split())  # Clean again
-                    
-                    # Only add if we have meaningful review text
-                    # Be more lenient - accept shorter reviews and don't filter out questions
-                    if len(review_text) > 15:
-                        self.results['reviews'].append({
-                            'index': len(self.results['reviews']) + 1,
-                            'text': review_text[:500],
-                            'full_text': review_text,
-                            'author': author,
-                            'rating': rating,
-                            'extracted_at': datetime.now().isoformat()
-                        })
-                        
-                        print(f"  [OK] Review {len(self.results['reviews'])}: {author} - {review_text[:60]}...")
-                        
-                        if len(self.results['reviews']) % 5 == 0:
-                            print(f"  [INFO] Collected {len(self.results['reviews'])} reviews...")
-                            
-                except Exception as e:
+            extracted_at = datetime.now().isoformat()
+            for card in reviews_found[:30]:  # Check more elements
+                # Star-selector probes up to the first hit plus two inner_text calls
+                self._count_legacy('reviews', card.get('legacy_star_probes', len(STAR_PROBES)) + 2)
+                
+                if 'record' in card:
+                    record = card['record']
+                else:
+                    with self.metrics.phase('review_parsing'):
+                        record = parse_review(card['text'], card.get('stars'))
+                if not record:
                     continue
+                
+                self._emit('reviews', Review(
+                    len(self.results['reviews']) + 1,
+                    card.get('key') or card_key(record, card['text']),
+                    record.text,
+                    record.author,
+                    record.rating,
+                    extracted_at
+                ))
+                
+                print(f"  [OK] Review {len(self.results['reviews'])}: {record.author} - {record.text[:60]}...")
+                
+                if len(self.results['reviews']) % 5 == 0:
+                    print(f"  [INFO] Collected {len(self.results['reviews'])} reviews...")
             
+            self.metrics.count('reviews', ITEMS_FOUND, len(all_articles))
+            self.metrics.count('reviews', ITEMS_KEPT, len(self.results['reviews']))
             print(f"[OK] Total reviews extracted: {len(self.results['reviews'])}")
             
         except Exception as e:
@@ -629,115 +1403,143 @@ class UdebrockScraper:
         """Extract images with infinite scroll"""
         print("")
         print("[INFO] Extracting images...")
+        kept_before = len(self.results['images'])
         
         # Navigate to photos tab
-        photos_url = f"{self.page_url}/photos"
+        photos_url = f"{self.page_url.rstrip('/')}/photos"
         
         try:
-            await page.goto(photos_url, wait_until='networkidle', timeout=20000)
-            await page.wait_for_timeout(2000)
+            await self._goto(page, photos_url, PHOTOS_READY_SELECTOR, budget_s=20)
             
             print("[INFO] Scrolling to load more photos...")
             
             # Infinite scroll for images
-            last_height = await page.evaluate('document.body.scrollHeight')
-            scroll_attempts = 0
-            max_scrolls = 15  # More scrolls for images
-            
-            while scroll_attempts < max_scrolls:
-                await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-                await page.wait_for_timeout(1500)
-                
-                new_height = await page.evaluate('document.body.scrollHeight')
-                
-                if new_height == last_height:
-                    await page.wait_for_timeout(1000)
-                    new_height = await page.evaluate('document.body.scrollHeight')
-                    if new_height == last_height:
-                        break
-                
-                last_height = new_height
-                scroll_attempts += 1
-                print(f"  [INFO] Scroll {scroll_attempts}/{max_scrolls}")
+            await self._scroll_feed(page, 'photos', item_selector='img[src*="scontent"]', key_kind='images')
             
             # Extract image URLs
-            images = await page.locator('img[src*="scontent"]').all()
+            images = await self._evaluate(page, 'photos', HARVEST_IMAGES_JS, 'img[src*="scontent"]')
+            self._count_legacy('photos', 1 + 2 * len(images))
+            self.metrics.count('photos', ITEMS_FOUND, len(images))
             
             print(f"[OK] Found {len(images)} image elements")
             
             seen = set()
-            for i, img in enumerate(images):
-                try:
-                    src = await img.get_attribute('src')
-                    alt = await img.get_attribute('alt') or ''
+            for img in images:
+                src = img['src']
+                alt = img['alt']
+                
+                if src and 'scontent' in src:
+                    key = image_key(src)
+                    if not self._accept('images', key, seen):
+                        continue
+                    self._emit('images', Image(len(self.results['images']) + 1, key, src, alt))
                     
-                    if src and 'scontent' in src and src not in seen:
-                        seen.add(src)
-                        self.results['images'].append({
-                            'index': len(self.results['images']) + 1,
-                            'url': src,
-                            'alt': alt,
-                            'source': 'facebook'
-                        })
-                        
-                        if len(self.results['images']) % 10 == 0:
-                            print(f"  [INFO] Collected {len(self.results['images'])} images...")
-                        
-                except:
-                    continue
+                    if len(self.results['images']) % 10 == 0:
+                        print(f"  [INFO] Collected {len(self.results['images'])} images...")
             
         except Exception as e:
             print(f"[WARN] Could not access photos tab: {e}")
             print("[INFO] Extracting images from main page instead...")
             
-            # Fallback: images from main page
-            await page.goto(self.page_url, wait_until='networkidle')
-            
-            for i in range(5):
-                await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-                await page.wait_for_timeout(1000)
-            
-            images = await page.locator('img[src*="scontent"]').all()
+            # Fallback: images from main page - best effort, a failure here
+            # must not cost the rest of the run
+            try:
+                await self._goto(page, self.page_url, PHOTOS_READY_SELECTOR)
+                
+                await self._scroll_feed(page, 'photos_fallback', item_selector='img[src*="scontent"]')
+                
+                images = await self._evaluate(page, 'photos', HARVEST_IMAGES_JS, 'img[src*="scontent"]')
+            except Exception as e:
+                print(f"[WARN] Could not extract images from main page: {e}")
+                images = []
+            self._count_legacy('photos', 1 + min(len(images), 50))
+            self.metrics.count('photos', ITEMS_FOUND, min(len(images), 50))
             seen = set()
             
             for img in images[:50]:
-                try:
-                    src = await img.get_attribute('src')
-                    if src and 'scontent' in src and src not in seen:
-                        seen.add(src)
-                        self.results['images'].append({
-                            'index': len(self.results['images']) + 1,
-                            'url': src,
-                            'alt': '',
-                            'source': 'facebook'
-                        })
-                except:
-                    continue
+                src = img['src']
+                if src and 'scontent' in src:
+                    key = image_key(src)
+                    if not self._accept('images', key, seen):
+                        continue
+                    self._emit('images', Image(len(self.results['images']) + 1, key, src))
         
+        self.metrics.count('photos', ITEMS_KEPT, len(self.results['images']) - kept_before)
         print(f"[OK] Total images extracted: {len(self.results['images'])}")
     
     def _save_results(self):
-        """Save results to JSON file"""
+        """Save results and run metrics to JSON files"""
         OUTPUT_DIR.mkdir(exist_ok=True)
         
-        # Save with timestamp
+        prefix = self._output_prefix()
+        
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        output_file = OUTPUT_DIR / f'scraped_data_{timestamp}.json'
+        latest_file = OUTPUT_DIR / f'{prefix}_latest.json'
+        
+        with self.metrics.phase('save'):
+            if self.scrape_store:
+                # History lives in the database; only the snapshot is exported
+                output_file = latest_file
+                written = self.scrape_store.export_latest(self.page_url, latest_file, history=self.incremental)
+            elif self.record_stream:
+                # Compact the stream into the timestamped snapshot, then swap
+                # a copy in as latest
+                self.record_stream.close()
+                output_file = self.record_stream.path.with_suffix('.json')
+                written = compact(self.record_stream.path, output_file)
+                tmp_file = latest_file.with_suffix('.tmp')
+                shutil.copyfile(output_file, tmp_file)
+                os.replace(tmp_file, latest_file)
+                written *= 2
+            else:
+                # Compact separators keep json on its C encoder (indent forces
+                # the pure-Python one) - same shape, a fraction of the time
+                data = json.dumps(self.results, ensure_ascii=False, default=to_json).encode('utf-8')
+                
+                # Save with timestamp
+                output_file = OUTPUT_DIR / f'{prefix}_{timestamp}.json'
+                with open(output_file, 'wb') as f:
+                    f.write(data)
+                
+                # Also save as latest - replaced atomically, so the website
+                # never reads a half-written file
+                tmp_file = latest_file.with_suffix('.tmp')
+                with open(tmp_file, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_file, latest_file)
+                written = 2 * len(data)
+            
+            if self.record_stream:
+                written += self.record_stream.bytes_written
+                self.record_stream.close()
+                self.record_stream.path.unlink()
+            self.metrics.count('save', BYTES_WRITTEN, written)
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(self.results, f, indent=2, ensure_ascii=False)
+        # What /api/reviews serves, precomputed from the snapshot just written
+        with self.metrics.phase('reviews_artifact'):
+            artifact = write_artifact(latest_file, OUTPUT_DIR,
+                                      f'reviews_{self.output_name}' if self.output_name else 'reviews')
         
-        # Also save as latest
-        latest_file = OUTPUT_DIR / 'scraped_data_latest.json'
-        with open(latest_file, 'w', encoding='utf-8') as f:
-            json.dump(self.results, f, indent=2, ensure_ascii=False)
+        if self.resource_filter:
+            self.metrics.info['network'] = self.resource_filter.stats
+        self.metrics.info['spare_budget_s'] = round(self.spare_s, 1)
+        metrics_name = f'metrics_{self.output_name}' if self.output_name else 'metrics'
+        metrics_file = OUTPUT_DIR / f'{metrics_name}_{timestamp}.json'
+        self.metrics.write(metrics_file)
+        if self.scrape_store:
+            self.scrape_store.finish_run(self.run_id, self.metrics.to_dict())
         
         print("")
         print("=" * 60)
         print("SCRAPING COMPLETE")
         print("=" * 60)
-        print(f"[OUTPUT] Saved to: {output_file}")
+        if self.scrape_store:
+            print(f"[OUTPUT] Stored run {self.run_id} in: {self.scrape_store.path}")
+        else:
+            print(f"[OUTPUT] Saved to: {output_file}")
         print(f"[OUTPUT] Latest: {latest_file}")
+        print(f"[OUTPUT] Reviews artifact: {OUTPUT_DIR / artifact['encodings']['identity']} (ETag {artifact['etag']})")
+        print(f"[OUTPUT] Metrics: {metrics_file}")
         print("")
         print("Summary:")
         print(f"  - Business: {self.results['business_name']}")
@@ -746,14 +1548,159 @@ class UdebrockScraper:
         print(f"  - Posts: {len(self.results['posts'])}")
         print(f"  - Images: {len(self.results['images'])}")
         print("")
+        print("Phases (wall time / Playwright round-trips / est. per-element equivalent):")
+        for phase, stats in self.metrics.phases.items():
+            line = f"  - {phase}: {stats['wall_s']:.2f}s / {stats.get(IPC_CALLS, 0)}"
+            if stats.get(IPC_CALLS_PER_ELEMENT):
+                line += f" / ~{stats[IPC_CALLS_PER_ELEMENT]} (est.)"
+            if stats.get(TIMEOUTS):
+                line += f" ({stats[TIMEOUTS]} timeouts)"
+            print(line)
+        print("")
+        if self.resource_filter:
+            print(f"Network: {self.resource_filter.summary()}")
+            print("")
+        
+        return output_file
+
+async def scrape_many(page_urls, pool_size: int = 3, **scraper_options):
+    """Scrape several pages through a bounded pool of contexts on one browser
+    
+    Each page gets its own context (no shared cookies/storage), its own
+    scraper and its own output files; a failure on one page does not stop
+    the others. Writes an aggregate batch_summary_<timestamp>.json.
+    """
+    page_urls = [url.strip() for url in page_urls if url.strip()]
+    semaphore = asyncio.Semaphore(max(1, pool_size))
+    started = datetime.now()
+    
+    from playwright.async_api import async_playwright
+    
+    # One parse pool for every page, spawned while the browser launches
+    parse_workers = scraper_options.pop('parse_workers', 0)
+    if parse_workers:
+        scraper_options['parse_pool'] = ParsePool(parse_workers)
+    
+    async with async_playwright() as p:
+        if parse_workers:
+            browser, _ = await asyncio.gather(launch_browser(p), scraper_options['parse_pool'].start())
+        else:
+            browser = await launch_browser(p)
+        
+        async def run_one(page_url):
+            async with semaphore:
+                scraper = UdebrockScraper(page_url, output_name=page_slug(page_url), **scraper_options)
+                page_started = datetime.now()
+                entry = {'page_url': page_url, 'output_name': scraper.output_name}
+                try:
+                    output_file = await scraper.scrape(browser)
+                    entry.update({
+                        'status': 'ok',
+                        'output_file': str(output_file),
+                        'reviews': len(scraper.results['reviews']),
+                        'posts': len(scraper.results['posts']),
+                        'images': len(scraper.results['images'])
+                    })
+                except Exception as e:
+                    entry.update({'status': 'error', 'error': str(e)})
+                entry['seconds'] = round((datetime.now() - page_started).total_seconds(), 1)
+                return entry
+        
+        try:
+            pages = await asyncio.gather(*(run_one(url) for url in page_urls))
+        finally:
+            await browser.close()
+            if parse_workers:
+                scraper_options['parse_pool'].close()
+    
+    summary = {
+        'started_at': started.isoformat(),
+        'seconds': round((datetime.now() - started).total_seconds(), 1),
+        'pool_size': pool_size,
+        'pages': pages,
+        'succeeded': sum(1 for entry in pages if entry['status'] == 'ok'),
+        'failed': sum(1 for entry in pages if entry['status'] != 'ok')
+    }
+    
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    summary_file = OUTPUT_DIR / f"batch_summary_{started.strftime('%Y%m%d_%H%M%S')}.json"
+    with open(summary_file, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    
+    print("")
+    print("=" * 60)
+    print("BATCH COMPLETE")
+    print("=" * 60)
+    print(f"[OUTPUT] Summary: {summary_file}")
+    print(f"  - Pages: {len(pages)} ({summary['succeeded']} ok, {summary['failed']} failed)")
+    print(f"  - Wall time: {summary['seconds']}s with pool size {pool_size}")
+    for entry in pages:
+        if entry['status'] == 'ok':
+            print(f"  [OK] {entry['page_url']}: {entry['reviews']} reviews, {entry['posts']} posts, {entry['images']} images ({entry['seconds']}s)")
+        else:
+            print(f"  [ERROR] {entry['page_url']}: {entry['error']}")
+    print("")
+    
+    return summary
+
+def read_page_urls():
+    """Batch page list from FB_PAGE_URLS (comma/newline separated) or FB_PAGE_URLS_FILE"""
+    urls = re.split(r'[,\n]', os.getenv('FB_PAGE_URLS', ''))
+    urls_file = os.getenv('FB_PAGE_URLS_FILE')
+    if urls_file:
+        with open(urls_file, encoding='utf-8') as f:
+            urls.extend(line for line in f if not line.lstrip().startswith('#'))
+    return [url.strip() for url in urls if url.strip()]
+
+def read_scraper_options() -> dict:
+    """UdebrockScraper options from SCRAPER_* environment variables"""
+    options = {
+        'parallel': os.getenv('SCRAPER_PARALLEL', '').lower() in ('1', 'true', 'yes'),
+        'concurrency': int(os.getenv('SCRAPER_CONCURRENCY', '3'))
+    }
+    if os.getenv('SCRAPER_RESOURCE_FILTER', '').lower() in ('0', 'false', 'no', 'off'):
+        options['resource_policy'] = False
+    if os.getenv('SCRAPER_INCREMENTAL', '').lower() in ('1', 'true', 'yes'):
+        options['incremental'] = True
+    if os.getenv('SCRAPER_DOWNLOAD_IMAGES', '').lower() in ('1', 'true', 'yes'):
+        options['download_images'] = True
+    if os.getenv('SCRAPER_CAPTURE_IMAGES', '').lower() in ('1', 'true', 'yes'):
+        options['capture_images'] = True
+    if os.getenv('SCRAPER_PERCEPTUAL_DEDUPE', '').lower() in ('1', 'true', 'yes'):
+        options['perceptual_dedupe'] = True
+    if os.getenv('SCRAPER_STORE', '').lower() in ('1', 'true', 'yes'):
+        options['store'] = True
+    if os.getenv('SCRAPER_STREAM', '').lower() in ('1', 'true', 'yes'):
+        options['stream'] = True
+    if os.getenv('SCRAPER_NEAR_DEDUPE', '').lower() in ('0', 'false', 'no', 'off'):
+        options['near_dedupe'] = False
+    if os.getenv('SCRAPER_PRUNE_DOM', '').lower() in ('1', 'true', 'yes'):
+        options['prune_dom'] = True
+    if os.getenv('SCRAPER_PARSE_WORKERS'):
+        options['parse_workers'] = int(os.getenv('SCRAPER_PARSE_WORKERS'))
+    if os.getenv('SCRAPER_HAR_MODE'):
+        options['har_mode'] = os.getenv('SCRAPER_HAR_MODE').lower()
+    return options
 
 async def main():
     """Main entry point"""
+    from dotenv import load_dotenv
+    
+    load_dotenv()
     print("")
     print("Starting Facebook business page scraper...")
     print("(No login required - works with public pages only)")
     print("")
     
+    options = read_scraper_options()
+    
+    batch_urls = read_page_urls()
+    if batch_urls:
+        pool_size = int(os.getenv('SCRAPER_POOL_SIZE', '3'))
+        print(f"[INFO] Batch mode: {len(batch_urls)} pages, pool size {pool_size}")
+        await scrape_many(batch_urls, pool_size, **options)
+        return
+    
     page_url = os.getenv('FB_PAGE_URL')
     
     if not page_url:
@@ -767,7 +1714,10 @@ async def main():
         print("[ERROR] Please update .env with your actual Facebook page URL")
         return
     
-    scraper = UdebrockScraper(page_url)
+    if os.getenv('SCRAPER_HAR_PATH'):
+        options['har_path'] = os.getenv('SCRAPER_HAR_PATH')
+    
+    scraper = UdebrockScraper(page_url, **options)
     await scraper.scrape()
 
 if __name__ == "__main__":
@@ -0,0 +1,95 @@
+"""
+Persistent index of already-scraped items
+Stable keys for reviews, posts and images, so refresh runs can stop
+scrolling once they reach content that is already stored
+"""
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlparse
+
+KINDS = ('reviews', 'posts', 'images')
+
+# Words that make up a card's key. Digits are ignored entirely, so
+# relative timestamps ("3d", "35w") and reaction counts that change
+# between runs do not change the key.
+_WORD = re.compile(r"[a-z][a-z']{2,}")
+UI_WORDS = {
+    'like', 'comment', 'share', 'reactions', 'all', 'see', 'more', 'less',
+    'send', 'message', 'follow', 'reply', 'most', 'relevant'
+}
+# Short enough that a "See more" truncated card (cut after roughly 35-40
+# words) and its expanded copy still produce the same key
+KEY_WORDS = 20
+
+def content_words(text: str) -> list:
+    """Lowercase words of a card minus UI labels, digits and short tokens"""
+    return [w for w in _WORD.findall((text or '').lower()) if w not in UI_WORDS]
+
+def item_key(text: str):
+    """Stable key for a review or post card, or None for cards with no words"""
+    words = content_words(text)
+    if not words:
+        return None
+    return hashlib.sha1(' '.join(words[:KEY_WORDS]).encode('utf-8')).hexdigest()[:16]
+
+def review_key(author: str, text: str):
+    """Stable key for a parsed review - live cards and stored records (whose
+    card header is gone) both key on the author and the cleaned body"""
+    return item_key(f"{author or ''} {text or ''}")
+
+def image_key(url: str):
+    """Stable key for a CDN image - the file name survives URL re-signing"""
+    if not url:
+        return None
+    name = urlparse(url).path.rsplit('/', 1)[-1]
+    return name or hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]
+
+class SeenIndex:
+    """Keys of every item already stored, persisted as JSON between runs"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.items = {kind: {} for kind in KINDS}
+        if self.path.exists():
+            with open(self.path, encoding='utf-8') as f:
+                stored = json.load(f)
+            for kind in KINDS:
+                self.items[kind].update(stored.get(kind, {}))
+
+    def __len__(self):
+        return sum(len(keys) for keys in self.items.values())
+
+    def has(self, kind: str, key) -> bool:
+        return key is not None and key in self.items[kind]
+
+    def add(self, kind: str, key, seen_at: str = None):
+        if key is not None:
+            self.items[kind].setdefault(key, seen_at or datetime.now().isoformat())
+
+    def seed(self, results: dict):
+        """Index records of a previously saved results file"""
+        for kind in KINDS:
+            for record in results.get(kind, []):
+                self.add(kind, record_key(kind, record), results.get('scraped_at'))
+
+    def save(self):
+        self.path.parent.mkdir(exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.items, f)
+        os.replace(tmp_path, self.path)
+
+def record_key(kind: str, record: dict):
+    """Key of a stored record; older files without a 'key' field are re-keyed
+    the same way live items are"""
+    if record.get('key'):
+        return record['key']
+    if kind == 'images':
+        return image_key(record.get('url'))
+    if kind == 'reviews':
+        return review_key(record.get('author'), record.get('full_text') or record.get('text'))
+    return item_key(record.get('full_text') or record.get('text'))
@@ -0,0 +1,87 @@
+"""
+Selector Cache
+Remembers which fallback selector actually matched, per page and field,
+and ranks it first next run. Probing itself is one compound query over
+every candidate (PROBE_SELECTORS_JS / the harvesters), so ranking decides
+precedence when several match rather than how many lookups are made.
+
+Candidates are CSS selectors; 'sel:contains(text)' also requires the
+element's text to contain `text` (e.g. 'span:contains(★)').
+"""
+import json
+import os
+from pathlib import Path
+
+CACHE_FILE = Path(__file__).parent / "output" / "selector_cache.json"
+
+# Every candidate of a field loses this share of its score whenever one of
+# them wins, so a selector that stops matching drops down within a few runs
+DECAY = 0.8
+
+# One compound querySelectorAll over all candidates, then per-candidate
+# match counts - every fallback is tried in a single round-trip
+PROBE_SELECTORS_JS = """
+(candidates) => {
+    const parse = (c) => {
+        const m = c.match(/^(.*):contains\\((.*)\\)$/);
+        return m ? [m[1], m[2]] : [c, null];
+    };
+    const parsed = candidates.map(parse);
+    const compound = Array.from(new Set(parsed.map(([sel]) => sel))).join(', ');
+    const counts = Object.fromEntries(candidates.map(c => [c, 0]));
+    for (const el of document.querySelectorAll(compound)) {
+        parsed.forEach(([sel, marker], i) => {
+            if (el.matches(sel) && (marker === null || (el.innerText || '').includes(marker))) {
+                counts[candidates[i]] += 1;
+            }
+        });
+    }
+    return counts;
+}
+"""
+
+class SelectorCache:
+    """Per-page, per-field selector scores, persisted as JSON between runs"""
+
+    def __init__(self, path=CACHE_FILE):
+        self.path = Path(path)
+        self.scores = {}  # page -> field -> selector -> score
+        self._touched = set()
+        if self.path.exists():
+            with open(self.path, encoding='utf-8') as f:
+                self.scores = json.load(f)
+
+    def rank(self, page: str, field: str, candidates) -> list:
+        """Candidates with past winners first, the rest in their given order"""
+        scores = self.scores.get(page, {}).get(field, {})
+        order = {selector: position for position, selector in enumerate(candidates)}
+        return sorted(candidates, key=lambda selector: (-scores.get(selector, 0), order[selector]))
+
+    def record(self, page: str, field: str, selector: str, wins: int = 1):
+        """Credit `selector` with `wins` matches for this page's field"""
+        scores = self.scores.setdefault(page, {}).setdefault(field, {})
+        for other in scores:
+            scores[other] = round(scores[other] * DECAY ** wins, 3)
+        scores[selector] = round(scores.get(selector, 0) + wins, 3)
+        self._touched.add(page)
+
+    def save(self):
+        """Write this cache's pages into the file, keeping other pages' entries
+
+        Batch runs share the file, so entries are merged rather than the
+        whole file replaced.
+        """
+        if not self._touched:
+            return
+        stored = {}
+        if self.path.exists():
+            with open(self.path, encoding='utf-8') as f:
+                stored = json.load(f)
+        for page in self._touched:
+            stored[page] = self.scores[page]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(stored, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._touched.clear()
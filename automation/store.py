@@ -0,0 +1,212 @@
+"""
+Scrape Store
+Embedded SQLite database of every scraped review, post, image and metadata
+field, upserted per run with first_seen/last_seen, plus a run history -
+and an atomic export of the latest JSON snapshot for the website
+"""
+import json
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+from records import TEXT_PREVIEW, to_json
+from seen_index import KINDS, record_key
+
+DB_FILE = Path(__file__).parent / "output" / "scraper.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    page_url TEXT NOT NULL,
+    business_name TEXT,
+    scraped_at TEXT NOT NULL,
+    finished_at TEXT,
+    reviews INTEGER NOT NULL DEFAULT 0,
+    posts INTEGER NOT NULL DEFAULT 0,
+    images INTEGER NOT NULL DEFAULT 0,
+    metrics TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_by_page ON runs (page_url, scraped_at);
+
+CREATE TABLE IF NOT EXISTS items (
+    page_url TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    first_run INTEGER NOT NULL,
+    last_run INTEGER NOT NULL,
+    PRIMARY KEY (page_url, kind, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS items_by_recency ON items (page_url, kind, last_seen DESC, position);
+
+CREATE TABLE IF NOT EXISTS metadata (
+    page_url TEXT NOT NULL,
+    field TEXT NOT NULL,
+    value TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    PRIMARY KEY (page_url, field)
+) WITHOUT ROWID;
+"""
+
+UPSERT_ITEM = f"""
+INSERT INTO items (page_url, kind, key, position, data, first_seen, last_seen, first_run, last_run)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (page_url, kind, key) DO UPDATE SET
+    position = excluded.position,
+    -- an item seen truncated this time keeps its longer stored text; every
+    -- other field (rating, author, extracted_at) comes from this run
+    data = CASE
+        WHEN length(coalesce(json_extract(data, '$.full_text'), ''))
+             > length(coalesce(json_extract(excluded.data, '$.full_text'), ''))
+        THEN json_set(excluded.data,
+                      '$.full_text', json_extract(data, '$.full_text'),
+                      '$.text', substr(json_extract(data, '$.full_text'), 1, {TEXT_PREVIEW}))
+        ELSE excluded.data
+    END,
+    last_seen = excluded.last_seen,
+    last_run = excluded.last_run
+"""
+
+UPSERT_METADATA = """
+INSERT INTO metadata (page_url, field, value, first_seen, last_seen)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (page_url, field) DO UPDATE SET
+    value = excluded.value,
+    last_seen = excluded.last_seen
+"""
+
+# Items an incremental run skipped as already stored were still on the page
+TOUCH_ITEM = """
+UPDATE items SET last_seen = ?, last_run = ?
+WHERE page_url = ? AND kind = ? AND key = ?
+"""
+
+# Newest run first, page order within a run; the stored JSON is patched
+# in SQL so the export never decodes and re-encodes the records. Items last
+# seen before run `last_run >= ?` are left out (0 = the whole history)
+SELECT_ITEMS = """
+SELECT json_set(data,
+                '$.index', row_number() OVER (ORDER BY last_seen DESC, position),
+                '$.first_seen', first_seen,
+                '$.last_seen', last_seen)
+FROM items
+WHERE page_url = ? AND kind = ? AND last_run >= ?
+ORDER BY last_seen DESC, position
+"""
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False, default=to_json)
+
+class ScrapeStore:
+    """Upserting SQLite store keyed by page URL, item kind and stable item key"""
+
+    def __init__(self, path=DB_FILE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path, timeout=30)
+        # WAL lets the website/exports read while a run is writing
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record_run(self, results: dict, known: dict = None) -> int:
+        """Upsert one run's items and metadata in a single transaction; returns the run id
+
+        known maps kind -> keys of stored items the run saw again without
+        collecting them (incremental mode); only their last_seen/last_run move.
+        """
+        page_url = results['page_url']
+        seen_at = results['scraped_at']
+        with self.db:
+            run_id = self.db.execute(
+                'INSERT INTO runs (page_url, business_name, scraped_at, reviews, posts, images) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (page_url, results.get('business_name'), seen_at,
+                 *(len(results.get(kind, [])) for kind in ('reviews', 'posts', 'images')))
+            ).lastrowid
+            for kind in KINDS:
+                rows = []
+                for position, record in enumerate(results.get(kind, []), 1):
+                    key = record_key(kind, record)
+                    if key is not None:
+                        rows.append((page_url, kind, key, position, _dumps(record),
+                                     seen_at, seen_at, run_id, run_id))
+                self.db.executemany(UPSERT_ITEM, rows)
+                self.db.executemany(TOUCH_ITEM, [
+                    (seen_at, run_id, page_url, kind, key) for key in (known or {}).get(kind, ())
+                ])
+            self.db.executemany(UPSERT_METADATA, [
+                (page_url, field, _dumps(value), seen_at, seen_at)
+                for field, value in results.get('metadata', {}).items()
+            ])
+        return run_id
+
+    def finish_run(self, run_id: int, metrics: dict = None):
+        with self.db:
+            self.db.execute(
+                'UPDATE runs SET finished_at = ?, metrics = ? WHERE id = ?',
+                (datetime.now().isoformat(), _dumps(metrics) if metrics else None, run_id)
+            )
+
+    def runs(self, page_url: str = None, limit: int = 20) -> list:
+        """Most recent runs, newest first"""
+        query = 'SELECT id, page_url, scraped_at, finished_at, reviews, posts, images FROM runs'
+        params = ()
+        if page_url:
+            query += ' WHERE page_url = ?'
+            params = (page_url,)
+        rows = self.db.execute(query + ' ORDER BY id DESC LIMIT ?', (*params, limit)).fetchall()
+        columns = ('id', 'page_url', 'scraped_at', 'finished_at', 'reviews', 'posts', 'images')
+        return [dict(zip(columns, row)) for row in rows]
+
+    def snapshot_json(self, page_url: str, history: bool = False) -> str:
+        """A page's items from its latest run in the scraped_data_*.json shape
+
+        Items gone from the page (deleted on Facebook) drop out with the
+        next run. history=True returns every item ever stored instead -
+        incremental runs only store what is new, so their snapshot is the
+        history.
+        """
+        run = self.db.execute(
+            'SELECT business_name, scraped_at, id FROM runs WHERE page_url = ? ORDER BY id DESC LIMIT 1',
+            (page_url,)
+        ).fetchone()
+        if run is None:
+            raise KeyError(f"No runs stored for {page_url}")
+        metadata = {
+            field: json.loads(value)
+            for field, value in self.db.execute(
+                'SELECT field, value FROM metadata WHERE page_url = ? ORDER BY field', (page_url,)
+            )
+        }
+        head = _dumps({'business_name': run[0], 'scraped_at': run[1], 'page_url': page_url})
+        parts = [head[:-1]]
+        for kind in ('reviews', 'images', 'posts'):
+            rows = (row[0] for row in self.db.execute(SELECT_ITEMS, (page_url, kind, 0 if history else run[2])))
+            parts.append(f', "{kind}": [{", ".join(rows)}]')
+        parts.append(f', "metadata": {_dumps(metadata)}}}')
+        return ''.join(parts)
+
+    def export_latest(self, page_url: str, path, history: bool = False) -> int:
+        """Write the page's snapshot atomically - readers see the old file or the new one"""
+        path = Path(path)
+        data = self.snapshot_json(page_url, history).encode('utf-8')
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return len(data)
@@ -0,0 +1,171 @@
+"""
+Near-Duplicate Text Dedupe
+MinHash signatures of each review's and post's opening words, bucketed
+with LSH and persisted across runs, so the same review collapses to one
+entry when it differs by a word or two, is truncated in one place and
+expanded in another, or shows up in both the posts feed and /reviews.
+Review signatures are scoped to their author.
+"""
+import hashlib
+import json
+import os
+import random
+from pathlib import Path
+
+from review_parser import is_review_card, parse_review
+from seen_index import content_words
+
+# Signatures cover the opening words only: a "See more" truncated copy
+# (cut after roughly 35-40 words) and its expanded copy share them
+WINDOW_WORDS = 24
+SHINGLE_WORDS = 3
+# Fewer content words than this and unrelated short cards would match
+MIN_WORDS = 6
+
+NUM_HASHES = 32
+BANDS = 16  # of NUM_HASHES // BANDS rows - candidates from ~0.3 similarity up
+# Share of equal signature slots (estimated Jaccard of the opening
+# shingles) for two texts to count as the same item
+THRESHOLD = 0.6
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x6d696e68)  # fixed, so signatures stay comparable across runs
+_HASH_PARAMS = [(_rng.randrange(1, _PRIME), _rng.randrange(_PRIME)) for _ in range(NUM_HASHES)]
+_ROWS = NUM_HASHES // BANDS
+
+def minhash(text: str):
+    """MinHash signature (NUM_HASHES 32-bit values) of the text's opening
+    word shingles, or None for texts too short to fingerprint"""
+    words = content_words(text)[:WINDOW_WORDS]
+    if len(words) < MIN_WORDS:
+        return None
+    values = [
+        int.from_bytes(hashlib.blake2b(' '.join(words[i:i + SHINGLE_WORDS]).encode('utf-8'), digest_size=8).digest(), 'big')
+        for i in range(len(words) - SHINGLE_WORDS + 1)
+    ]
+    return tuple(min((a * value + b) % _PRIME for value in values) & 0xffffffff for a, b in _HASH_PARAMS)
+
+def similarity(a: tuple, b: tuple) -> float:
+    return sum(x == y for x, y in zip(a, b)) / NUM_HASHES
+
+class NearDuplicateIndex:
+    """Persistent signature -> canonical item key index, per kind"""
+
+    def __init__(self, path, threshold: float = THRESHOLD):
+        self.path = Path(path)
+        self.threshold = threshold
+        self.entries = []  # [kind, key, hex signature, author], rebuilt into the buckets on load
+        self.signatures = []
+        self.buckets = {}  # (band, slot values) -> entry positions
+        if self.path.exists():
+            with open(self.path, encoding='utf-8') as f:
+                for kind, key, signature, *author in json.load(f):
+                    self._insert(kind, key, tuple(int(signature[i:i + 8], 16) for i in range(0, len(signature), 8)),
+                                 author[0] if author else None)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _bands(self, signature: tuple):
+        for band in range(BANDS):
+            yield band, signature[band * _ROWS:(band + 1) * _ROWS]
+
+    def _insert(self, kind: str, key: str, signature: tuple, author: str = None):
+        position = len(self.entries)
+        self.entries.append([kind, key, ''.join(f'{value:08x}' for value in signature), author])
+        self.signatures.append(signature)
+        for bucket in self._bands(signature):
+            self.buckets.setdefault(bucket, []).append(position)
+
+    def find(self, signature: tuple, kind: str, author: str = None):
+        """Key of the most similar stored `kind` item by the same author at
+        or above the threshold, or None"""
+        candidates = set()
+        for bucket in self._bands(signature):
+            candidates.update(self.buckets.get(bucket, ()))
+        best, best_score = None, self.threshold
+        for position in candidates:
+            entry_kind, _, _, entry_author = self.entries[position]
+            if entry_kind != kind or entry_author != author:
+                continue
+            score = similarity(signature, self.signatures[position])
+            if score >= best_score:
+                best, best_score = self.entries[position][1], score
+        return best
+
+    def canonical(self, signature: tuple, kind: str, key: str, author: str = None) -> str:
+        """Key of the stored near-duplicate, or `key` itself after indexing it"""
+        match = self.find(signature, kind, author)
+        if match:
+            return match
+        self._insert(kind, key, signature, author)
+        return key
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, self.path)
+
+def _author(name):
+    """Normalised author a review signature is scoped to - short reviews by
+    different customers ("Great job, very professional...") look alike"""
+    return ' '.join((name or '').lower().split()) or None
+
+def _fingerprint(kind: str, record):
+    """(text, author) a record is fingerprinted by. Review bodies as
+    parse_review cleans them - a review reposted in the feed carries the
+    card header and action bar around the same body - so such a post also
+    gets the review's author; other posts have none"""
+    text = record['full_text']
+    if kind == 'reviews':
+        return text, _author(record['author'])
+    if is_review_card(text):
+        parsed = parse_review(text)
+        if parsed:
+            return parsed.text, _author(parsed.author)
+    return text, None
+
+def collapse_duplicates(results: dict, index: NearDuplicateIndex) -> dict:
+    """Collapse near-duplicate reviews and posts of one run's results in place
+
+    Each kept record takes the key of its near-duplicate from earlier runs,
+    so it stays one item in the seen index, snapshot merge and store; within
+    the run, duplicates fold into the first copy, which keeps the longest
+    text. A post that is a copy of a review by the same author is dropped
+    in favour of the review; reviews only match reviews by their own
+    author. Returns the number of records folded away per kind.
+    """
+    kept = {'reviews': {}, 'posts': {}}
+    folded = {'reviews': 0, 'posts': 0}
+    for kind in ('reviews', 'posts'):
+        collapsed = []
+        for record in results[kind]:
+            text, author = _fingerprint(kind, record)
+            signature = minhash(text)
+            if signature is not None:
+                if kind == 'posts' and author:
+                    review_key = index.find(signature, 'reviews', author)
+                    if review_key:
+                        review = kept['reviews'].get(review_key)
+                        if review is not None and len(text) > len(review['full_text']):
+                            review['full_text'] = text
+                        folded[kind] += 1
+                        continue
+                record['key'] = index.canonical(signature, kind, record['key'], author if kind == 'reviews' else None)
+
+            canonical = kept[kind].get(record['key'])
+            if canonical is not None and (kind == 'posts' or _author(canonical['author']) == author):
+                if len(record['full_text']) > len(canonical['full_text']):
+                    canonical['full_text'] = record['full_text']
+                folded[kind] += 1
+                continue
+            kept[kind][record['key']] = record
+            collapsed.append(record)
+
+        for position, record in enumerate(collapsed, 1):
+            record['index'] = position
+        results[kind] = collapsed
+    index.save()
+    return folded